@@ -1,3 +1,5 @@
+from typing import Dict
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -10,10 +12,107 @@ class Settings(BaseSettings):
     neo4j_user: str = Field(default="neo4j")
     neo4j_password: str = Field(default="password")
 
+    # Driver pool sizing; the pool is per worker process.
+    neo4j_max_connection_pool_size: int = 100
+    neo4j_connection_acquisition_timeout: float = 60.0
+    neo4j_max_connection_lifetime: float = 3600.0
+    neo4j_fetch_size: int = 1000
+
     secret_key: str = Field(default="my-secret-key-not-prod-use")
     algorithm: str = Field(default="HS256")
 
     access_token_expire_minutes: int = 30
+    token_cache_size: int = 10_000
+
+    password_hash_executor: str = Field(default="thread")
+    password_hash_workers: int = 4
+    password_hash_queue_size: int = 32
+
+    # "migrate" applies pending migrations, "check" refuses to start if
+    # any are pending or a required index is not ONLINE, "off" skips both.
+    schema_mode: str = Field(default="migrate")
+    schema_index_timeout_seconds: int = 300
+
+    autocomplete_timeout_ms: int = 100
+
+    # Admission control: low-priority reads are shed with 503 once this
+    # many transactions wait for a pool slot, or the pool is full and the
+    # smoothed slot wait reaches max_pool_wait_ms; normal reads at twice
+    # that. route_limits overrides per-prefix concurrency limits, e.g.
+    # ADMISSION_ROUTE_LIMITS='{"/users/search": 64}'.
+    admission_enabled: bool = True
+    admission_max_pool_queue: int = 32
+    admission_max_pool_wait_ms: float = 100
+    admission_retry_after_seconds: int = 1
+    admission_route_limits: Dict[str, int] = Field(default_factory=dict)
+
+    # Queries at or above this latency are logged to "app.slow_query";
+    # 0 disables the log. Per-query metrics are always collected.
+    slow_query_threshold_ms: float = 500
+
+    # PROFILE capture: every request when "always" is set, otherwise only
+    # requests whose X-Profile-Queries header equals the token (unset
+    # token disables the header). Plans are written as JSON to the dir.
+    query_profile_always: bool = False
+    query_profile_token: str = ""
+    query_profile_dir: str = "profiles"
+
+    # Write-behind likes: intents are coalesced per (user, post) and
+    # written every flush_ms, or once max_size are pending.
+    like_buffer_enabled: bool = False
+    like_buffer_flush_ms: float = 100
+    like_buffer_max_size: int = 5_000
+
+    post_cache_size: int = 10_000
+    post_cache_ttl_seconds: float = 30
+    profile_cache_size: int = 10_000
+    profile_cache_ttl_seconds: float = 60
+    mutual_count_cache_size: int = 10_000
+    mutual_count_cache_ttl_seconds: float = 300
+
+    feed_backend: str = Field(default="memory")
+    # A full inbox takes roughly 160 KB per process. With inbox_ttl set,
+    # inboxes are rebuilt that long after they were built, which bounds how
+    # long posts created through other workers are missing; 0 keeps them
+    # until eviction and suits a single worker. Feeds end at max_size.
+    feed_max_size: int = 500
+    feed_max_users: int = 10_000
+    feed_inbox_ttl_seconds: float = 0
+
+    # Hybrid feed: posts by authors with at least this many followers are
+    # not fanned out; feeds pull them from per-author rings of the newest
+    # ring_size posts instead (0 fans out every post). Rings are reloaded
+    # after ring_ttl; who a user follows above the threshold is cached for
+    # pulled_authors_ttl.
+    feed_pull_follower_threshold: int = 10_000
+    feed_author_ring_size: int = 200
+    feed_author_rings_max: int = 10_000
+    feed_author_ring_ttl_seconds: float = 30
+    feed_pulled_authors_cache_size: int = 10_000
+    feed_pulled_authors_cache_ttl_seconds: float = 60
+
+    # Ranked feed: a post needs 10x the engagement (likes plus weighted
+    # comments) to rank level with one decay_seconds newer. Scores of
+    # posts within window_seconds are rebuilt every refresh_seconds
+    # (0 disables the refresh; writes still update scores).
+    feed_rank_decay_seconds: float = 45_000
+    feed_rank_comment_weight: float = 2.0
+    feed_rank_window_seconds: float = 7 * 86_400
+    feed_rank_max_posts: int = 200_000
+    feed_rank_refresh_seconds: float = 60
+
+    # Friend-of-friend suggestions: candidates are read through at most
+    # friend_limit followed users and fanout_limit of each one's follows;
+    # the top store_size are stored per user and refreshed by background
+    # workers on follow changes and when older than max_age (checked every
+    # sweep_interval; 0 disables the sweep, 0 workers disables storage).
+    suggestion_friend_limit: int = 500
+    suggestion_fanout_limit: int = 200
+    suggestion_store_size: int = 100
+    suggestion_refresh_workers: int = 2
+    suggestion_queue_size: int = 10_000
+    suggestion_max_age_seconds: float = 86_400
+    suggestion_sweep_interval_seconds: float = 600
 
     class Config:
         env_file = ".env"
@@ -1,20 +1,68 @@
+import asyncio
 import logging
-from neo4j import AsyncGraphDatabase
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+from neo4j import WRITE_ACCESS, AsyncGraphDatabase, AsyncSession
 from app.config import settings
+from app.utils.metrics import Histogram, registry
+from app.utils.query_metrics import instrument_transaction
 
 logger = logging.getLogger(__name__)
 
+pool_slot_wait = registry.register(
+    Histogram(
+        "neo4j_pool_slot_wait_seconds",
+        "Time a transaction waited for a connection pool slot.",
+    )
+)
+
+
+class PoolWait:
+    """Slot waits of one request, summed over its transactions."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.transactions = 0
+
+
+current_pool_wait: ContextVar[Optional[PoolWait]] = ContextVar(
+    "current_pool_wait", default=None
+)
+
 
 class Neo4jConnection:
 
     def __init__(self):
         self._driver = None
+        # One slot per pooled connection. Every transaction takes a slot
+        # for as long as it runs so that waiting for the pool happens (and
+        # is timed) here rather than inside the driver.
+        self._slots = asyncio.Semaphore(
+            settings.neo4j_max_connection_pool_size
+        )
+        self.slots_in_use = 0
+        self.slots_waiting = 0
+        self.pool_wait_count = 0
+        self.pool_wait_seconds_total = 0.0
+        self.pool_wait_seconds_max = 0.0
+        self.pool_wait_seconds_ewma = 0.0
 
     async def connect(self):
         try:
             self._driver = AsyncGraphDatabase.driver(
                 settings.neo4j_uri,
                 auth=(settings.neo4j_user, settings.neo4j_password),
+                max_connection_pool_size=(
+                    settings.neo4j_max_connection_pool_size
+                ),
+                connection_acquisition_timeout=(
+                    settings.neo4j_connection_acquisition_timeout
+                ),
+                max_connection_lifetime=settings.neo4j_max_connection_lifetime,
+                fetch_size=settings.neo4j_fetch_size,
             )
 
             await self._driver.verify_connectivity()
@@ -32,5 +80,138 @@ class Neo4jConnection:
     def get_driver(self):
         return self._driver
 
+    def session(self) -> "LazySession":
+        return LazySession(self)
+
+    async def acquire_slot(self) -> float:
+        """Wait for a pool slot and return how long that took."""
+        started = time.perf_counter()
+        self.slots_waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.slots_waiting -= 1
+        self.slots_in_use += 1
+
+        waited = time.perf_counter() - started
+        pool_slot_wait.observe(waited)
+        self.pool_wait_count += 1
+        self.pool_wait_seconds_total += waited
+        self.pool_wait_seconds_max = max(self.pool_wait_seconds_max, waited)
+        self.pool_wait_seconds_ewma += 0.1 * (
+            waited - self.pool_wait_seconds_ewma
+        )
+        request_wait = current_pool_wait.get()
+        if request_wait is not None:
+            request_wait.seconds += waited
+            request_wait.transactions += 1
+        return waited
+
+    def release_slot(self):
+        self.slots_in_use -= 1
+        self._slots.release()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire_slot()
+        try:
+            yield
+        finally:
+            self.release_slot()
+
+    def pool_stats(self) -> dict:
+        # The driver has no public pool API; read its connection table and
+        # degrade to zeros if that ever changes.
+        pool = getattr(self._driver, "_pool", None)
+        connections = [
+            connection
+            for per_address in getattr(pool, "connections", {}).values()
+            for connection in list(per_address)
+        ]
+        in_use = sum(1 for c in connections if getattr(c, "in_use", False))
+        max_size = settings.neo4j_max_connection_pool_size
+        return {
+            "max_size": max_size,
+            "open": len(connections),
+            "in_use": in_use,
+            "idle": len(connections) - in_use,
+            "utilisation": in_use / max_size if max_size else 0.0,
+            "slots_in_use": self.slots_in_use,
+            "slots_waiting": self.slots_waiting,
+            "pool_wait_count": self.pool_wait_count,
+            "pool_wait_seconds_total": self.pool_wait_seconds_total,
+            "pool_wait_seconds_max": self.pool_wait_seconds_max,
+            "pool_wait_seconds_ewma": self.pool_wait_seconds_ewma,
+        }
+
+
+class LazySession:
+    """Session proxy that holds a pool slot only while a transaction runs.
+
+    The driver session is opened on first use, so requests that fail
+    authentication or validation, or that are served from a cache, never
+    touch the pool. A slot is taken around each managed transaction and
+    each ``transaction()`` block, not for the life of the request, so work
+    between queries (password hashing, serialization, sending) does not
+    count against the pool. Managed transactions are instrumented for
+    per-query metrics.
+    """
+
+    def __init__(self, connection: Neo4jConnection):
+        self._connection = connection
+        self._session: Optional[AsyncSession] = None
+
+    def _get_session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._connection.get_driver().session()
+        return self._session
+
+    async def execute_read(self, transaction_function, *args, **kwargs):
+        async with self._connection.slot():
+            return await self._get_session().execute_read(
+                instrument_transaction(transaction_function), *args, **kwargs
+            )
+
+    async def execute_write(self, transaction_function, *args, **kwargs):
+        async with self._connection.slot():
+            return await self._get_session().execute_write(
+                instrument_transaction(transaction_function, write=True),
+                *args,
+                **kwargs,
+            )
+
+    @asynccontextmanager
+    async def transaction(self, access_mode: str = WRITE_ACCESS):
+        """Explicit transaction holding a slot until the block exits.
+
+        It runs on its own driver session so that ``access_mode`` applies
+        and it cannot collide with the managed transactions above. The
+        transaction is rolled back unless the block commits it.
+        """
+        async with self._connection.slot():
+            session = self._connection.get_driver().session(
+                default_access_mode=access_mode
+            )
+            try:
+                tx = await session.begin_transaction()
+                try:
+                    yield tx
+                finally:
+                    await tx.close()
+            finally:
+                await session.close()
+
+    async def close(self):
+        if self._session is None:
+            return
+        session, self._session = self._session, None
+        await session.close()
+
+    async def __aenter__(self) -> "LazySession":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
 
 neo4j_connection = Neo4jConnection()
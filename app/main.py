@@ -3,19 +3,42 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from app.database import neo4j_connection
-from app.routers import auth, social, users, posts
+from app.middleware.admission import AdmissionMiddleware
+from app.middleware.pool_wait import PoolWaitMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.migrations import prepare_schema
+from app.services.feed_ranking import feed_ranker
+from app.services.like_buffer import like_buffer
+from app.services.suggestion_service import suggestion_engine
+from app.routers import auth, export, social, users, posts, system
+from app.utils.password_hasher import password_hasher
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await neo4j_connection.connect()
+    await prepare_schema(neo4j_connection.get_driver())
+    suggestion_engine.start()
+    feed_ranker.start()
+    like_buffer.start()
     yield
+    await like_buffer.stop()
+    await feed_ranker.stop()
+    await suggestion_engine.stop()
     await neo4j_connection.close()
+    password_hasher.shutdown()
 
 
 app = FastAPI(title="Neo4J Social net API", lifespan=lifespan)
+app.add_middleware(PoolWaitMiddleware)
+app.add_middleware(ProfilingMiddleware)
+# Added last so that it is outermost and sheds before any other work.
+app.add_middleware(AdmissionMiddleware)
 
 app.include_router(auth.auth_router)
 app.include_router(social.social_router)
 app.include_router(users.users_router)
 app.include_router(posts.posts_router)
+app.include_router(export.export_router)
+app.include_router(system.system_router)
+app.include_router(system.metrics_router)
@@ -0,0 +1,204 @@
+"""Admission control and load shedding keyed on Neo4j pool saturation.
+
+Every request is classified by ``ADMISSION_RULES`` into a priority:
+``CRITICAL`` (auth and writes), ``NORMAL`` (other reads) or ``LOW``
+(expensive reads). Operational endpoints are exempt. A request is
+rejected with ``503`` and ``Retry-After`` when:
+
+- its route already has ``max_concurrency`` requests in flight; or
+- the pool is saturated and its priority is shed at that level. The
+  pool is saturated when ``ADMISSION_MAX_POOL_QUEUE`` transactions are
+  waiting for a slot, or when every slot is taken and the smoothed
+  slot wait exceeds ``ADMISSION_MAX_POOL_WAIT_MS``. ``LOW`` is shed at
+  saturation, ``NORMAL`` at twice the thresholds, and ``CRITICAL`` is
+  never shed for pool pressure.
+
+This is a plain ASGI middleware rather than an ``app.middleware("http")``
+function so that a request holds its concurrency slot until its response
+body has been sent, which matters for the streaming exports.
+"""
+
+import enum
+import math
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+from app.database import neo4j_connection
+from app.utils.metrics import Counter, registry
+
+shed_requests = registry.register(
+    Counter(
+        "http_requests_shed_total",
+        "Requests rejected by admission control.",
+        ["priority", "reason"],
+    )
+)
+
+
+class Priority(enum.IntEnum):
+    CRITICAL = 0
+    NORMAL = 1
+    LOW = 2
+
+
+@dataclass(frozen=True)
+class AdmissionRule:
+    """Requests whose path starts with ``prefix``.
+
+    ``methods`` of ``None`` matches every method. ``max_concurrency`` of 0
+    means unlimited; ``ADMISSION_ROUTE_LIMITS`` overrides it by prefix.
+    """
+
+    prefix: str
+    priority: Priority
+    methods: Optional[FrozenSet[str]] = None
+    max_concurrency: int = 0
+
+
+_READ = frozenset({"GET", "HEAD"})
+
+EXEMPT_PREFIXES: Tuple[str, ...] = (
+    "/metrics",
+    "/system",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+)
+
+# First match wins; unmatched reads are NORMAL and writes CRITICAL.
+ADMISSION_RULES: List[AdmissionRule] = [
+    AdmissionRule("/auth", Priority.CRITICAL),
+    AdmissionRule("/export", Priority.LOW, _READ, max_concurrency=4),
+    AdmissionRule(
+        "/social/suggestions", Priority.LOW, _READ, max_concurrency=16
+    ),
+    AdmissionRule("/users/search", Priority.LOW, _READ, max_concurrency=32),
+    AdmissionRule(
+        "/social/mutual-followers", Priority.LOW, _READ, max_concurrency=32
+    ),
+]
+_DEFAULT_READ = AdmissionRule("", Priority.NORMAL)
+_DEFAULT_WRITE = AdmissionRule("", Priority.CRITICAL)
+
+# Pool pressure level at which each priority is shed.
+_SHED_AT_PRESSURE = {Priority.LOW: 1, Priority.NORMAL: 2}
+
+
+class AdmissionController:
+    def __init__(self, rules: List[AdmissionRule]):
+        self.rules = rules
+        self.in_flight: Dict[AdmissionRule, int] = {}
+        self.admitted = 0
+        self.shed: Dict[str, int] = {}
+
+    def classify(self, method: str, path: str) -> Optional[AdmissionRule]:
+        if path.startswith(EXEMPT_PREFIXES):
+            return None
+        for rule in self.rules:
+            if path.startswith(rule.prefix) and (
+                rule.methods is None or method in rule.methods
+            ):
+                return rule
+        return _DEFAULT_READ if method in _READ else _DEFAULT_WRITE
+
+    def pool_pressure(self) -> int:
+        """0 when healthy, 1 when saturated, 2 at twice the thresholds."""
+        max_queue = settings.admission_max_pool_queue
+        max_wait = settings.admission_max_pool_wait_ms / 1000
+        waiting = neo4j_connection.slots_waiting
+        full = (
+            neo4j_connection.slots_in_use
+            >= settings.neo4j_max_connection_pool_size
+        )
+        wait = neo4j_connection.pool_wait_seconds_ewma
+
+        for level in (2, 1):
+            if (max_queue and waiting >= level * max_queue) or (
+                full and max_wait and wait >= level * max_wait
+            ):
+                return level
+        return 0
+
+    def limit(self, rule: AdmissionRule) -> int:
+        return settings.admission_route_limits.get(
+            rule.prefix, rule.max_concurrency
+        )
+
+    def admit(self, rule: AdmissionRule) -> Optional[str]:
+        """Take a slot for ``rule``, or return why the request is shed."""
+        limit = self.limit(rule)
+        if limit and self.in_flight.get(rule, 0) >= limit:
+            return self._shed(rule, "concurrency")
+        shed_at = _SHED_AT_PRESSURE.get(rule.priority)
+        if shed_at and self.pool_pressure() >= shed_at:
+            return self._shed(rule, "pool")
+
+        self.in_flight[rule] = self.in_flight.get(rule, 0) + 1
+        self.admitted += 1
+        return None
+
+    def release(self, rule: AdmissionRule) -> None:
+        self.in_flight[rule] -= 1
+
+    def _shed(self, rule: AdmissionRule, reason: str) -> str:
+        priority = rule.priority.name.lower()
+        shed_requests.inc(priority, reason)
+        key = f"{priority}_{reason}"
+        self.shed[key] = self.shed.get(key, 0) + 1
+        return reason
+
+    def retry_after(self) -> int:
+        # At least the configured floor, longer while slot waits are long.
+        return max(
+            settings.admission_retry_after_seconds,
+            math.ceil(neo4j_connection.pool_wait_seconds_ewma),
+        )
+
+    def stats(self) -> dict:
+        return {
+            "pool_pressure": self.pool_pressure(),
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "in_flight": {
+                (rule.prefix or "*") + f" ({rule.priority.name.lower()})": n
+                for rule, n in self.in_flight.items()
+            },
+        }
+
+
+admission_controller = AdmissionController(ADMISSION_RULES)
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller or admission_controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.admission_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        rule = self.controller.classify(scope["method"], scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        reason = self.controller.admit(rule)
+        if reason is not None:
+            response = JSONResponse(
+                {"detail": f"Service overloaded ({reason}), retry later"},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(self.controller.retry_after())},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(rule)
@@ -0,0 +1,45 @@
+"""ASGI middleware that records how long each request waited for the pool.
+
+``LazySession`` takes a pool slot per transaction, so one request can
+wait several times. ``Neo4jConnection.acquire_slot`` adds every wait to
+the ``PoolWait`` in ``current_pool_wait``; this middleware sets one up per
+request and, once the response body has been sent, observes the total in
+``http_request_pool_wait_seconds``. Requests that never took a slot are
+not observed.
+"""
+
+from app.database import PoolWait, current_pool_wait
+from app.utils.metrics import Histogram, registry
+
+request_pool_wait = registry.register(
+    Histogram(
+        "http_request_pool_wait_seconds",
+        "Total time a request's transactions waited for pool slots.",
+        ["endpoint"],
+    )
+)
+
+
+class PoolWaitMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        wait = PoolWait()
+        reset_token = current_pool_wait.set(wait)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_pool_wait.reset(reset_token)
+            if wait.transactions:
+                request_pool_wait.observe(wait.seconds, _endpoint(scope))
+
+
+def _endpoint(scope) -> str:
+    # Unmatched paths share a label so that 404s cannot grow the metric.
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
@@ -0,0 +1,125 @@
+"""ASGI middleware that captures and ``PROFILE``s a request's Cypher.
+
+Profiling is on for every request when ``QUERY_PROFILE_ALWAYS`` is set,
+or per request when the ``X-Profile-Queries`` header matches
+``QUERY_PROFILE_TOKEN``. The queries captured before the response starts
+are profiled then and summarized in ``X-Query-Profile*`` response
+headers. Queries a streamed body runs afterwards are profiled once it is
+complete. The full plans of both are written to ``QUERY_PROFILE_DIR``.
+
+Like ``AdmissionMiddleware`` this is plain ASGI: requests that are not
+profiled go straight to the app, and streamed bodies are not buffered.
+"""
+
+import asyncio
+import logging
+import secrets
+from pathlib import Path
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config import settings
+from app.database import current_pool_wait, neo4j_connection
+from app.utils.metrics import Counter, registry
+from app.utils.query_metrics import redact_params
+from app.utils.query_profile import QueryProfile, current_profile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile-Queries"
+
+profiled_db_hits = registry.register(
+    Counter(
+        "neo4j_profiled_db_hits_total",
+        "Database hits measured by PROFILE captures.",
+        ["endpoint", "query"],
+    )
+)
+
+
+def _profiling_requested(scope) -> bool:
+    if settings.query_profile_always:
+        return True
+    token = Headers(scope=scope).get(PROFILE_HEADER)
+    # compare_digest only accepts ASCII str, so compare bytes instead.
+    return bool(
+        token
+        and settings.query_profile_token
+        and secrets.compare_digest(
+            token.encode("latin-1", "replace"),
+            settings.query_profile_token.encode(),
+        )
+    )
+
+
+async def _run(profile: QueryProfile) -> None:
+    # Reuse the request's session. Its transactions are finished by now
+    # and it holds no pool slot between them, so the re-run takes one slot
+    # at a time instead of competing with the request for two.
+    # Its slot waits are not the request's own, so keep them out of the
+    # request's pool wait total.
+    reset_token = current_pool_wait.set(None)
+    try:
+        if profile.session is not None:
+            await profile.run(profile.session)
+        else:
+            async with neo4j_connection.session() as session:
+                await profile.run(session)
+    finally:
+        current_pool_wait.reset(reset_token)
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _profiling_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile(scope["method"], scope["path"])
+
+        async def send_with_profile(message):
+            if message["type"] == "http.response.start" and profile.queries:
+                try:
+                    await _run(profile)
+                except Exception as e:
+                    logger.warning(
+                        f"Query profiling failed for {_endpoint(scope)}: {e}"
+                    )
+                else:
+                    MutableHeaders(scope=message).update(profile.headers())
+            await send(message)
+
+        reset_token = current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            current_profile.reset(reset_token)
+
+        if profile.queries:
+            await self._finish(scope, profile)
+
+    async def _finish(self, scope, profile: QueryProfile) -> None:
+        endpoint = _endpoint(scope)
+        try:
+            await _run(profile)
+            path = await asyncio.to_thread(
+                profile.write, Path(settings.query_profile_dir), redact_params
+            )
+        except Exception as e:
+            logger.warning(f"Query profiling failed for {endpoint}: {e}")
+            return
+
+        for captured in profile.queries:
+            profiled_db_hits.inc(
+                endpoint, captured.tag, amount=captured.db_hits
+            )
+        logger.info(f"Query profile for {endpoint} written to {path}")
+
+
+def _endpoint(scope) -> str:
+    # The route is only known once the router has matched the request.
+    route = scope.get("route")
+    return getattr(route, "path", scope["path"])
@@ -0,0 +1,203 @@
+"""Versioned schema migrations applied before the app accepts traffic.
+
+Each ``Migration`` is a list of idempotent schema statements. Applied
+versions are recorded as ``(:SchemaMigration {version})`` nodes so that a
+restart only runs what is new. Append new migrations to ``MIGRATIONS``;
+never edit one that has shipped.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import List, Set, Tuple
+
+from neo4j import AsyncDriver, AsyncSession
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+    indexes: Tuple[str, ...] = ()
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version=1,
+        description="Uniqueness constraints and created_at indexes",
+        statements=(
+            """
+            CREATE CONSTRAINT schema_migration_version_unique IF NOT EXISTS
+            FOR (m:SchemaMigration) REQUIRE m.version IS UNIQUE
+            """,
+            """
+            CREATE CONSTRAINT user_email_unique IF NOT EXISTS
+            FOR (u:User) REQUIRE u.email IS UNIQUE
+            """,
+            """
+            CREATE CONSTRAINT user_username_unique IF NOT EXISTS
+            FOR (u:User) REQUIRE u.username IS UNIQUE
+            """,
+            """
+            CREATE CONSTRAINT user_id_unique IF NOT EXISTS
+            FOR (u:User) REQUIRE u.user_id IS UNIQUE
+            """,
+            """
+            CREATE CONSTRAINT post_id_unique IF NOT EXISTS
+            FOR (p:Post) REQUIRE p.post_id IS UNIQUE
+            """,
+            """
+            CREATE CONSTRAINT comment_id_unique IF NOT EXISTS
+            FOR (c:Comment) REQUIRE c.comment_id IS UNIQUE
+            """,
+            """
+            CREATE INDEX user_created_at IF NOT EXISTS
+            FOR (u:User) ON (u.created_at)
+            """,
+            """
+            CREATE INDEX post_created_at IF NOT EXISTS
+            FOR (p:Post) ON (p.created_at)
+            """,
+            """
+            CREATE INDEX comment_created_at IF NOT EXISTS
+            FOR (c:Comment) ON (c.created_at)
+            """,
+        ),
+        indexes=(
+            "schema_migration_version_unique",
+            "user_email_unique",
+            "user_username_unique",
+            "user_id_unique",
+            "post_id_unique",
+            "comment_id_unique",
+            "user_created_at",
+            "post_created_at",
+            "comment_created_at",
+        ),
+    ),
+    Migration(
+        version=2,
+        description="Full-text index for user search and autocomplete",
+        statements=(
+            """
+            CREATE FULLTEXT INDEX user_search IF NOT EXISTS
+            FOR (u:User) ON EACH [u.username, u.full_name]
+            """,
+        ),
+        indexes=("user_search",),
+    ),
+    Migration(
+        version=3,
+        description="Index for finding stale follow suggestion lists",
+        statements=(
+            """
+            CREATE INDEX user_suggestions_computed_at IF NOT EXISTS
+            FOR (u:User) ON (u.suggestions_computed_at)
+            """,
+        ),
+        indexes=("user_suggestions_computed_at",),
+    ),
+]
+
+
+def required_indexes() -> Set[str]:
+    return {name for m in MIGRATIONS for name in m.indexes}
+
+
+async def applied_versions(session: AsyncSession) -> Set[int]:
+    result = await session.run(
+        "MATCH (m:SchemaMigration) RETURN m.version AS version"
+    )
+    return {record["version"] async for record in result}
+
+
+async def online_indexes(session: AsyncSession) -> Set[str]:
+    result = await session.run(
+        "SHOW INDEXES YIELD name, state WHERE state = 'ONLINE' RETURN name"
+    )
+    return {record["name"] async for record in result}
+
+
+async def wait_for_indexes(session: AsyncSession) -> None:
+    """Block until every index is ONLINE or the timeout elapses."""
+    result = await session.run(
+        "CALL db.awaitIndexes($timeout)",
+        timeout=settings.schema_index_timeout_seconds,
+    )
+    await result.consume()
+
+
+async def apply_migrations(driver: AsyncDriver) -> List[int]:
+    """Apply every pending migration and return the versions applied."""
+    applied = []
+    async with driver.session() as session:
+        done = await applied_versions(session)
+        for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+            if migration.version in done:
+                continue
+
+            logger.info(
+                f"Applying schema migration {migration.version}: "
+                f"{migration.description}"
+            )
+            # Schema statements cannot share a transaction with data
+            # writes, so each one runs as its own auto-commit query.
+            for statement in migration.statements:
+                result = await session.run(statement)
+                await result.consume()
+
+            await wait_for_indexes(session)
+
+            result = await session.run(
+                """
+                MERGE (m:SchemaMigration {version: $version})
+                ON CREATE SET m.description = $description,
+                              m.applied_at = datetime()
+                """,
+                version=migration.version,
+                description=migration.description,
+            )
+            await result.consume()
+            applied.append(migration.version)
+
+        await _check_schema(session)
+
+    return applied
+
+
+async def _check_schema(session: AsyncSession) -> None:
+    pending = {m.version for m in MIGRATIONS} - await applied_versions(session)
+    if pending:
+        raise SchemaError(f"Pending schema migrations: {sorted(pending)}")
+
+    missing = required_indexes() - await online_indexes(session)
+    if missing:
+        raise SchemaError(
+            f"Required indexes missing or not ONLINE: {sorted(missing)}"
+        )
+
+
+async def check_schema(driver: AsyncDriver) -> None:
+    """Raise ``SchemaError`` unless the schema is fully migrated."""
+    async with driver.session() as session:
+        await _check_schema(session)
+
+
+async def prepare_schema(driver: AsyncDriver) -> None:
+    """Run the startup schema step selected by ``settings.schema_mode``."""
+    if settings.schema_mode == "migrate":
+        applied = await apply_migrations(driver)
+        if applied:
+            logger.info(f"Applied schema migrations: {applied}")
+    elif settings.schema_mode == "check":
+        await check_schema(driver)
+    elif settings.schema_mode != "off":
+        raise ValueError(f"Unknown schema mode: {settings.schema_mode}")
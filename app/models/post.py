@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -28,11 +28,20 @@ class PostResponse(BaseModel):
         return to_python_datetime(v)
 
 
+class PostPage(BaseModel):
+    items: List[PostResponse]
+    next_cursor: Optional[str] = None
+    # Home feed only: the last page stopped at the inbox or ring cap, so
+    # older posts exist but are not served.
+    truncated: bool = False
+
+
 class LikePostResponse(BaseModel):
     post_id: str
     user_id: str
     created_at: datetime
     success: bool
+    error: Optional[str] = None
 
     @field_validator("created_at", mode="before")
     @classmethod
@@ -45,6 +54,7 @@ class UnlikePostResponse(BaseModel):
     user_id: str
     created_at: datetime
     success: bool
+    error: Optional[str] = None
 
     @field_validator("created_at", mode="before")
     @classmethod
@@ -52,6 +62,18 @@ class UnlikePostResponse(BaseModel):
         return to_python_datetime(v)
 
 
+class PostBatchRequest(BaseModel):
+    post_ids: List[str] = Field(min_length=1, max_length=100)
+
+
+class LikePostsResponse(BaseModel):
+    results: List[LikePostResponse]
+
+
+class UnlikePostsResponse(BaseModel):
+    results: List[UnlikePostResponse]
+
+
 class CommentCreate(BaseModel):
     content: str = Field(min_length=1, max_length=200)
 
@@ -67,3 +89,8 @@ class CommentResponse(BaseModel):
     @classmethod
     def parse_created_at(cls, v):
         return to_python_datetime(v)
+
+
+class CommentPage(BaseModel):
+    items: List[CommentResponse]
+    next_cursor: Optional[str] = None
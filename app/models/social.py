@@ -1,4 +1,6 @@
 from datetime import datetime
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 
@@ -7,6 +9,7 @@ class FollowResponse(BaseModel):
     followed_id: str
     created_at: datetime
     success: bool
+    error: Optional[str] = None
 
 
 class UnfollowResponse(BaseModel):
@@ -14,3 +17,18 @@ class UnfollowResponse(BaseModel):
     followed_id: str
     created_at: datetime
     success: bool
+    error: Optional[str] = None
+
+
+class FollowUsersResponse(BaseModel):
+    results: List[FollowResponse]
+
+
+class UnfollowUsersResponse(BaseModel):
+    results: List[UnfollowResponse]
+
+
+class MutualFollowersCount(BaseModel):
+    user1_id: str
+    user2_id: str
+    count: int
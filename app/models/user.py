@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
@@ -36,3 +36,17 @@ class UserResponse(UserBase):
     @classmethod
     def parse_created_at(cls, v):
         return to_python_datetime(v)
+
+
+class UserPage(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
+
+
+class UserAutocompleteItem(BaseModel):
+    user_id: str
+    username: str
+
+
+class UserBatchRequest(BaseModel):
+    user_ids: List[str] = Field(min_length=1, max_length=100)
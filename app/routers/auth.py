@@ -3,16 +3,21 @@ from fastapi.security import OAuth2PasswordRequestForm
 from neo4j import AsyncSession
 
 from app.models.user import UserCreate, UserResponse
-from app.utils.dependencies import get_db_session, get_current_user
+from app.utils.dependencies import (
+    get_db_session,
+    get_current_user,
+    get_profile_loader,
+    get_refresh_token_payload,
+)
+from app.utils.dataloader import DataLoader
 from app.services.user_service import UserService
 from app.models.auth import (
     LoginRequest,
     LoginResponse,
-    TokenRefreshRequest,
     TokenRefreshResponse,
 )
 from app.utils.security import create_access_token, create_refresh_token
-from app.utils.security import decode_refresh_token
+from app.utils.password_hasher import PasswordHasherBusy
 
 auth_router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -30,6 +35,12 @@ async def signup(
         return user
     except HTTPException:
         raise
+    except PasswordHasherBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
@@ -66,6 +77,12 @@ async def login(
         )
     except HTTPException:
         raise
+    except PasswordHasherBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
@@ -78,17 +95,12 @@ async def login(
     status_code=status.HTTP_200_OK,
 )
 async def refresh_token(
-    refresh_request: TokenRefreshRequest,
+    payload: dict = Depends(get_refresh_token_payload),
     session: AsyncSession = Depends(get_db_session),
+    profile_loader: DataLoader = Depends(get_profile_loader),
 ) -> TokenRefreshResponse:
-    payload = decode_refresh_token(refresh_request.refresh_token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired refresh token",
-        )
     user_id = payload["user_id"]
-    user_service = UserService(session)
+    user_service = UserService(session, profile_loader)
     user = await user_service.get_user_profile(user_id)
     if not user:
         raise HTTPException(
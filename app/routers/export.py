@@ -0,0 +1,84 @@
+from typing import AsyncIterator, Callable
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.database import LazySession, neo4j_connection
+from app.services.post_service import PostService
+from app.services.social_service import SocialService
+from app.services.user_service import UserService
+from app.utils.dependencies import get_db_session, get_current_user
+from app.utils.responses import NDJSONResponse
+
+export_router = APIRouter(prefix="/export", tags=["export"])
+
+
+async def _require_user(session: LazySession, user_id: str) -> None:
+    # The request session is closed here rather than when the dependency
+    # exits, which only happens after the whole stream has been sent.
+    try:
+        user = await UserService(session).get_user_profile(user_id)
+    finally:
+        await session.close()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+
+
+async def _stream(rows: Callable[[LazySession], AsyncIterator]):
+    """Run ``rows`` on a session that lives exactly as long as the stream.
+
+    The session is opened on the first chunk and closed when the stream
+    ends or the client disconnects.
+    """
+    async with neo4j_connection.session() as session:
+        async for row in rows(session):
+            yield row
+
+
+@export_router.get(
+    "/followers/{user_id}",
+    response_class=NDJSONResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def export_followers(
+    user_id: str,
+    current_user: str = Depends(get_current_user),
+    session: LazySession = Depends(get_db_session),
+) -> NDJSONResponse:
+    await _require_user(session, user_id)
+    return NDJSONResponse(
+        _stream(lambda s: SocialService(s).stream_followers(user_id))
+    )
+
+
+@export_router.get(
+    "/following/{user_id}",
+    response_class=NDJSONResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def export_following(
+    user_id: str,
+    current_user: str = Depends(get_current_user),
+    session: LazySession = Depends(get_db_session),
+) -> NDJSONResponse:
+    await _require_user(session, user_id)
+    return NDJSONResponse(
+        _stream(lambda s: SocialService(s).stream_following(user_id))
+    )
+
+
+@export_router.get(
+    "/posts/{user_id}",
+    response_class=NDJSONResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def export_posts(
+    user_id: str,
+    current_user: str = Depends(get_current_user),
+    session: LazySession = Depends(get_db_session),
+) -> NDJSONResponse:
+    await _require_user(session, user_id)
+    return NDJSONResponse(
+        _stream(lambda s: PostService(s).stream_user_posts(user_id))
+    )
@@ -1,17 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from neo4j import AsyncSession
 
 from app.models.post import (
     CommentCreate,
+    CommentPage,
     CommentResponse,
     LikePostResponse,
+    LikePostsResponse,
+    PostBatchRequest,
     PostCreate,
     PostResponse,
     UnlikePostResponse,
+    UnlikePostsResponse,
+)
+from app.utils.dependencies import (
+    get_current_user,
+    get_db_session,
+    get_optional_user,
 )
-from app.utils.dependencies import get_db_session, get_current_user
 from app.services.post_service import PostService
-from typing import List
+from app.utils.responses import ModelJSONResponse
+from typing import Optional
 
 posts_router = APIRouter(prefix="/posts", tags=["posts"])
 
@@ -21,23 +30,63 @@ posts_router = APIRouter(prefix="/posts", tags=["posts"])
 )
 async def create_post(
     post_create: PostCreate,
-    session: AsyncSession = Depends(get_db_session),
     current_user: str = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db_session),
 ) -> PostResponse:
     post_service = PostService(session)
     post = await post_service.create_post(current_user, post_create)
     return post
 
 
+@posts_router.post(
+    "/like/batch",
+    response_model=LikePostsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def like_posts(
+    batch_request: PostBatchRequest,
+    current_user: str = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db_session),
+) -> LikePostsResponse:
+    post_service = PostService(session)
+    results = await post_service.like_posts(
+        current_user, batch_request.post_ids
+    )
+    return LikePostsResponse(results=results)
+
+
+@posts_router.post(
+    "/unlike/batch",
+    response_model=UnlikePostsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def unlike_posts(
+    batch_request: PostBatchRequest,
+    current_user: str = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db_session),
+) -> UnlikePostsResponse:
+    post_service = PostService(session)
+    results = await post_service.unlike_posts(
+        current_user, batch_request.post_ids
+    )
+    return UnlikePostsResponse(results=results)
+
+
 @posts_router.get(
     "/{post_id}", response_model=PostResponse, status_code=status.HTTP_200_OK
 )
 async def get_post(
-    post_id: str, session: AsyncSession = Depends(get_db_session)
-) -> PostResponse:
+    post_id: str,
+    current_user: Optional[str] = Depends(get_optional_user),
+    session: AsyncSession = Depends(get_db_session),
+) -> ModelJSONResponse:
     post_service = PostService(session)
-    post = await post_service.get_post(post_id)
-    return post
+    post = await post_service.get_post(post_id, current_user)
+    if not post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
+        )
+    return ModelJSONResponse(post)
 
 
 @posts_router.post(
@@ -47,8 +96,8 @@ async def get_post(
 )
 async def like_post(
     post_id: str,
-    session: AsyncSession = Depends(get_db_session),
     current_user: str = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db_session),
 ) -> LikePostResponse:
     post_service = PostService(session)
     return await post_service.like_post(current_user, post_id)
@@ -61,8 +110,8 @@ async def like_post(
 )
 async def unlike_post(
     post_id: str,
-    session: AsyncSession = Depends(get_db_session),
     current_user: str = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db_session),
 ) -> UnlikePostResponse:
     post_service = PostService(session)
     return await post_service.unlike_post(current_user, post_id)
@@ -76,8 +125,8 @@ async def unlike_post(
 async def comment_on_post(
     post_id: str,
     comment_create: CommentCreate,
-    session: AsyncSession = Depends(get_db_session),
     current_user: str = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db_session),
 ) -> CommentResponse:
     post_service = PostService(session)
     comment = await post_service.create_comment(
@@ -88,14 +137,20 @@ async def comment_on_post(
 
 @posts_router.get(
     "/{post_id}/comments",
-    response_model=List[CommentResponse],
+    response_model=CommentPage,
     status_code=status.HTTP_200_OK,
 )
 async def get_post_comments(
     post_id: str,
     session: AsyncSession = Depends(get_db_session),
-    limit: int = 50,
-) -> List[CommentResponse]:
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+) -> ModelJSONResponse:
     post_service = PostService(session)
-    comments = await post_service.get_post_comments(post_id, limit)
-    return comments
+    try:
+        page = await post_service.get_post_comments(post_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+    return ModelJSONResponse(page)
@@ -1,21 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from neo4j import AsyncSession
 
-from app.models.user import UserResponse
+from app.config import settings
+from app.models.user import UserBatchRequest, UserPage, UserResponse
 from app.utils.dependencies import get_db_session, get_current_user
+from app.utils.responses import ModelJSONResponse
 from app.services.social_service import SocialService
-from typing import List
-from app.models.post import PostResponse
-from app.models.social import FollowResponse, UnfollowResponse
+from typing import List, Literal, Optional, Union
+from app.models.post import PostPage
+from app.models.social import (
+    FollowResponse,
+    FollowUsersResponse,
+    MutualFollowersCount,
+    UnfollowResponse,
+    UnfollowUsersResponse,
+)
 
 social_router = APIRouter(prefix="/social", tags=["social"])
 
 
+@social_router.post(
+    "/follow/batch",
+    response_model=FollowUsersResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def follow_users(
+    batch_request: UserBatchRequest,
+    current_user: str = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db_session),
+) -> FollowUsersResponse:
+    social_service = SocialService(session)
+    results = await social_service.follow_users(
+        current_user, batch_request.user_ids
+    )
+    return FollowUsersResponse(results=results)
+
+
+@social_router.post(
+    "/unfollow/batch",
+    response_model=UnfollowUsersResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def unfollow_users(
+    batch_request: UserBatchRequest,
+    current_user: str = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db_session),
+) -> UnfollowUsersResponse:
+    social_service = SocialService(session)
+    results = await social_service.unfollow_users(
+        current_user, batch_request.user_ids
+    )
+    return UnfollowUsersResponse(results=results)
+
+
 @social_router.post("/follow/{user_id}", status_code=status.HTTP_200_OK)
 async def follow_user(
     user_id: str,
-    session: AsyncSession = Depends(get_db_session),
     current_user: str = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db_session),
 ) -> FollowResponse:
     social_service = SocialService(session)
     followed = await social_service.follow_user(current_user, user_id)
@@ -25,8 +67,8 @@ async def follow_user(
 @social_router.post("/unfollow/{user_id}", status_code=status.HTTP_200_OK)
 async def unfollow_user(
     user_id: str,
-    session: AsyncSession = Depends(get_db_session),
     current_user: str = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db_session),
 ) -> UnfollowResponse:
     social_service = SocialService(session)
     unfollowed = await social_service.unfollow_user(current_user, user_id)
@@ -35,64 +77,94 @@ async def unfollow_user(
 
 @social_router.get(
     "/followers/{user_id}",
-    response_model=List[UserResponse],
+    response_model=UserPage,
     status_code=status.HTTP_200_OK,
 )
 async def get_followers(
     user_id: str,
     session: AsyncSession = Depends(get_db_session),
-    limit: int = 50,
-) -> List[UserResponse]:
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+) -> ModelJSONResponse:
     social_service = SocialService(session)
-    followers = await social_service.get_followers(user_id, limit)
-    return followers
+    try:
+        page = await social_service.get_followers(user_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+    return ModelJSONResponse(page)
 
 
 @social_router.get(
     "/following/{user_id}",
-    response_model=List[UserResponse],
+    response_model=UserPage,
     status_code=status.HTTP_200_OK,
 )
 async def get_following(
     user_id: str,
     session: AsyncSession = Depends(get_db_session),
-    limit: int = 50,
-) -> List[UserResponse]:
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+) -> ModelJSONResponse:
     social_service = SocialService(session)
-    following = await social_service.get_following(user_id, limit)
-    return following
+    try:
+        page = await social_service.get_following(user_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+    return ModelJSONResponse(page)
 
 
 @social_router.get(
     "/mutual-followers/{user1_id}/{user2_id}",
-    response_model=List[UserResponse],
+    response_model=Union[UserPage, MutualFollowersCount],
     status_code=status.HTTP_200_OK,
 )
 async def get_mutual_followers(
     user1_id: str,
     user2_id: str,
     session: AsyncSession = Depends(get_db_session),
-) -> List[UserResponse]:
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    count_only: bool = False,
+) -> ModelJSONResponse:
     social_service = SocialService(session)
-    mutual_followers = await social_service.get_mutual_followers(
-        user1_id, user2_id
-    )
-    return mutual_followers
+    if count_only:
+        count = await social_service.count_mutual_followers(user1_id, user2_id)
+        return ModelJSONResponse(count)
+    try:
+        page = await social_service.get_mutual_followers(
+            user1_id, user2_id, limit, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+    return ModelJSONResponse(page)
 
 
 @social_router.get(
     "/feed",
-    response_model=List[PostResponse],
+    response_model=PostPage,
     status_code=status.HTTP_200_OK,
 )
 async def get_feed(
     user_id: str = Depends(get_current_user),
     session: AsyncSession = Depends(get_db_session),
-    limit: int = 50,
-) -> List[PostResponse]:
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    mode: Literal["chronological", "ranked"] = "chronological",
+) -> ModelJSONResponse:
     social_service = SocialService(session)
-    feed = await social_service.get_feed(user_id, limit)
-    return feed
+    try:
+        page = await social_service.get_feed(user_id, limit, cursor, mode)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+    return ModelJSONResponse(page)
 
 
 @social_router.get(
@@ -103,8 +175,13 @@ async def get_feed(
 async def get_suggestions(
     user_id: str,
     session: AsyncSession = Depends(get_db_session),
-    limit: int = 50,
-) -> List[UserResponse]:
+    # Only SUGGESTION_STORE_SIZE suggestions are stored per user.
+    limit: int = Query(
+        min(50, settings.suggestion_store_size),
+        ge=1,
+        le=settings.suggestion_store_size,
+    ),
+) -> ModelJSONResponse:
     social_service = SocialService(session)
     suggestions = await social_service.suggest_users(user_id, limit)
-    return suggestions
+    return ModelJSONResponse(suggestions)
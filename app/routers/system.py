@@ -0,0 +1,45 @@
+from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
+
+from app.database import neo4j_connection
+from app.middleware.admission import admission_controller
+from app.services.feed_ranking import feed_ranker
+from app.services.like_buffer import like_buffer
+from app.services.suggestion_service import suggestion_engine
+from app.utils.cache import mutual_count_cache, post_cache, profile_cache
+from app.utils.feed_store import author_rings
+from app.utils.metrics import registry, render_gauges
+from app.utils.password_hasher import password_hasher
+from app.utils.security import token_cache
+
+system_router = APIRouter(prefix="/system", tags=["system"])
+metrics_router = APIRouter(tags=["system"])
+
+
+@system_router.get("/stats", status_code=status.HTTP_200_OK)
+async def get_stats() -> dict:
+    return {
+        "neo4j_pool": neo4j_connection.pool_stats(),
+        "admission": admission_controller.stats(),
+        "password_hasher": password_hasher.metrics(),
+        "token_cache": token_cache.stats(),
+        "post_cache": post_cache.stats(),
+        "profile_cache": profile_cache.stats(),
+        "author_rings": author_rings.stats(),
+        "mutual_count_cache": mutual_count_cache.stats(),
+        "suggestion_engine": suggestion_engine.metrics(),
+        "feed_ranker": feed_ranker.metrics(),
+        "like_buffer": like_buffer.metrics(),
+    }
+
+
+@metrics_router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_metrics() -> str:
+    """Prometheus text exposition of query metrics and pool gauges."""
+    return registry.render() + render_gauges(
+        "neo4j_pool", neo4j_connection.pool_stats(), "Neo4j pool statistic."
+    )
@@ -1,10 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from neo4j import AsyncSession
 
-from app.models.user import UserResponse
-from app.utils.dependencies import get_db_session, get_current_user
+from app.models.user import (
+    UserAutocompleteItem,
+    UserBatchRequest,
+    UserPage,
+    UserResponse,
+)
+from app.utils.dataloader import DataLoader
+from app.utils.dependencies import (
+    get_db_session,
+    get_current_user,
+    get_profile_loader,
+)
+from app.utils.responses import ModelJSONResponse
 from app.services.user_service import UserService
-from typing import List
+from typing import List, Optional
 
 users_router = APIRouter(prefix="/users", tags=["users"])
 
@@ -13,27 +24,67 @@ users_router = APIRouter(prefix="/users", tags=["users"])
     "/me", response_model=UserResponse, status_code=status.HTTP_200_OK
 )
 async def get_current_user(
-    session: AsyncSession = Depends(get_db_session),
     current_user: str = Depends(get_current_user),
-) -> UserResponse:
-    user_service = UserService(session)
+    session: AsyncSession = Depends(get_db_session),
+    profile_loader: DataLoader = Depends(get_profile_loader),
+) -> ModelJSONResponse:
+    user_service = UserService(session, profile_loader)
     user = await user_service.get_user_profile(current_user)
-    return user
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    return ModelJSONResponse(user)
 
 
 @users_router.get(
     "/search",
-    response_model=List[UserResponse],
+    response_model=UserPage,
     status_code=status.HTTP_200_OK,
 )
 async def search_users(
     q: str,
     session: AsyncSession = Depends(get_db_session),
-    limit: int = 20,
-):
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+) -> ModelJSONResponse:
     user_service = UserService(session)
-    users = await user_service.search_users(q, limit)
-    return users
+    try:
+        page = await user_service.search_users(q, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+    return ModelJSONResponse(page)
+
+
+@users_router.get(
+    "/autocomplete",
+    response_model=List[UserAutocompleteItem],
+    status_code=status.HTTP_200_OK,
+)
+async def autocomplete_users(
+    q: str = Query(min_length=1, max_length=30),
+    session: AsyncSession = Depends(get_db_session),
+    limit: int = Query(10, ge=1, le=20),
+) -> ModelJSONResponse:
+    user_service = UserService(session)
+    items = await user_service.autocomplete_users(q, limit)
+    return ModelJSONResponse(items)
+
+
+@users_router.post(
+    "/batch",
+    response_model=List[UserResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_user_profiles(
+    batch_request: UserBatchRequest,
+    profile_loader: DataLoader = Depends(get_profile_loader),
+) -> ModelJSONResponse:
+    user_ids = list(dict.fromkeys(batch_request.user_ids))
+    users = await profile_loader.load_many(user_ids)
+    return ModelJSONResponse([user for user in users if user is not None])
 
 
 @users_router.get(
@@ -42,7 +93,12 @@ async def search_users(
 async def get_user_profile(
     user_id: str,
     session: AsyncSession = Depends(get_db_session),
-) -> UserResponse:
-    user_service = UserService(session)
+    profile_loader: DataLoader = Depends(get_profile_loader),
+) -> ModelJSONResponse:
+    user_service = UserService(session, profile_loader)
     user = await user_service.get_user_profile(user_id)
-    return user
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    return ModelJSONResponse(user)
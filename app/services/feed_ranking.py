@@ -0,0 +1,205 @@
+"""Time-decayed engagement scores for the ranked home feed.
+
+``hot_score`` adds the log of a post's engagement to its age in units of
+``feed_rank_decay_seconds``, so a post needs ten times the engagement to
+rank level with one that much newer. The score of a post only changes
+when it is liked or commented on, never with the passage of time, so it
+can be precomputed.
+
+``post_scores`` is a process-local table of scores for recent posts. The
+like, unlike and comment paths update it from the counters their writes
+return. ``FeedRanker`` rebuilds it every ``feed_rank_refresh_seconds``
+from the denormalized counters, which picks up engagement recorded by
+other processes. Both paths keep only posts within
+``feed_rank_window_seconds``, at most ``feed_rank_max_posts`` of them, so
+the table stays bounded even with the refresh disabled. Posts missing
+from the table score as if they had no engagement. A ranked feed page is then an in-memory sort of the inbox
+followed by the same page query as the chronological feed.
+"""
+
+import asyncio
+import heapq
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from neo4j import AsyncSession
+
+from app.config import settings
+from app.database import neo4j_connection
+from app.utils.feed_store import FeedEntry
+from app.utils.neo4j_helpers import stream_read, to_python_datetime
+
+logger = logging.getLogger(__name__)
+
+
+def _utc(value) -> datetime:
+    created_at = to_python_datetime(value)
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at
+
+
+def hot_score(likes: int, comments: int, created_at: datetime) -> float:
+    created_at = _utc(created_at)
+    engagement = likes + settings.feed_rank_comment_weight * comments
+    return (
+        math.log10(1 + max(engagement, 0))
+        + created_at.timestamp() / settings.feed_rank_decay_seconds
+    )
+
+
+class PostScores:
+    """Scores by post id, with the post's creation time for eviction.
+
+    ``update`` ignores posts older than ``window`` seconds. Once the table
+    exceeds ``max_posts`` it drops posts that have aged out of the window
+    and then the oldest, down to 90% of the limit so that pruning runs
+    once per many updates rather than on every one.
+    """
+
+    def __init__(self, max_posts: int, window: float):
+        self.max_posts = max_posts
+        self.window = window
+        # post_id -> (score, created_at timestamp)
+        self._scores: Dict[str, Tuple[float, float]] = {}
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def update(
+        self, post_id: str, likes: int, comments: int, created_at
+    ) -> None:
+        created_at = _utc(created_at)
+        created = created_at.timestamp()
+        if created < time.time() - self.window:
+            self._scores.pop(post_id, None)
+            return
+        score = hot_score(likes or 0, comments or 0, created_at)
+        self._scores[post_id] = (score, created)
+        if len(self._scores) > self.max_posts:
+            self._prune()
+
+    def replace(self, scores: Dict[str, Tuple[float, float]]) -> None:
+        self._scores = scores
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.window
+        kept = {
+            post_id: item
+            for post_id, item in self._scores.items()
+            if item[1] >= cutoff
+        }
+        target = int(self.max_posts * 0.9)
+        if len(kept) > target:
+            newest = heapq.nlargest(
+                target, kept.items(), key=lambda pair: pair[1][1]
+            )
+            kept = dict(newest)
+        self.evicted += len(self._scores) - len(kept)
+        self._scores = kept
+
+    def sort_key(self, entry: FeedEntry) -> Tuple[float, str]:
+        item = self._scores.get(entry.post_id)
+        if item is None:
+            return (hot_score(0, 0, entry.created_at), entry.post_id)
+        return (item[0], entry.post_id)
+
+
+class FeedRankingService:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def recent_scores(self) -> Dict[str, Tuple[float, float]]:
+        """Scores of posts newer than ``feed_rank_window_seconds``."""
+        query = """
+        MATCH (p:Post)
+        WHERE p.created_at >= datetime() - duration({seconds: $window})
+        RETURN p.post_id AS post_id,
+               p.likes_count AS likes_count,
+               p.comments_count AS comments_count,
+               p.created_at AS created_at
+        ORDER BY p.created_at DESC
+        LIMIT $limit
+        """
+
+        scores = {}
+        async for record in stream_read(
+            self.session,
+            query,
+            window=int(settings.feed_rank_window_seconds),
+            limit=settings.feed_rank_max_posts,
+        ):
+            created_at = _utc(record["created_at"])
+            scores[record["post_id"]] = (
+                hot_score(
+                    record["likes_count"] or 0,
+                    record["comments_count"] or 0,
+                    created_at,
+                ),
+                created_at.timestamp(),
+            )
+        return scores
+
+
+class FeedRanker:
+    """Background task that rebuilds ``post_scores`` periodically."""
+
+    def __init__(self, scores: PostScores, interval: float):
+        self.scores = scores
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+        self.refreshed = 0
+        self.failed = 0
+        self.last_refresh_seconds = 0.0
+
+    def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def refresh(self) -> None:
+        started = time.perf_counter()
+        try:
+            async with neo4j_connection.session() as session:
+                scores = await FeedRankingService(session).recent_scores()
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Feed score refresh failed: {e}")
+            return
+        self.scores.replace(scores)
+        self.refreshed += 1
+        self.last_refresh_seconds = time.perf_counter() - started
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    def metrics(self) -> dict:
+        return {
+            "posts": len(self.scores),
+            "evicted": self.scores.evicted,
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+            "last_refresh_seconds": self.last_refresh_seconds,
+        }
+
+
+post_scores = PostScores(
+    max_posts=settings.feed_rank_max_posts,
+    window=settings.feed_rank_window_seconds,
+)
+feed_ranker = FeedRanker(
+    post_scores, interval=settings.feed_rank_refresh_seconds
+)
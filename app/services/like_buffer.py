@@ -0,0 +1,231 @@
+"""Write-behind buffer for likes and unlikes.
+
+Every like is a ``MERGE`` on the post node and takes its lock, so a viral
+post serializes thousands of single-like transactions per second and
+they hold pool connections while they wait. With ``like_buffer_enabled``
+set, ``PostService.like_posts``/``unlike_posts`` record the intent here
+instead. The last intent per ``(user, post)`` wins. Intents are written
+as two ``UNWIND`` batches every ``like_buffer_flush_ms``, or sooner once
+``like_buffer_max_size`` are pending. Each batch updates a post's
+``likes_count`` once per flush rather than once per like.
+
+Until an intent is written, ``overlay`` applies it to the ``is_liked``
+and ``likes_count`` the user sees. Other users see the change after the
+flush. ``stop`` drains the buffer on shutdown.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from neo4j import AsyncSession, Record
+
+from app.config import settings
+from app.database import neo4j_connection
+from app.models.post import PostResponse
+from app.services.feed_ranking import post_scores
+from app.utils.cache import post_cache
+from app.utils.neo4j_helpers import run_write
+
+logger = logging.getLogger(__name__)
+
+# (user_id, post_id) -> (liked, created_at)
+Intents = Dict[Tuple[str, str], Tuple[bool, str]]
+
+
+class LikeBufferService:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def write_likes(self, likes: List[dict]) -> List[Record]:
+        query = """
+        UNWIND $likes AS like
+        MATCH (u:User {user_id: like.user_id})
+        MATCH (p:Post {post_id: like.post_id})
+        WHERE NOT (u)-[:LIKES]->(p)
+        CREATE (u)-[:LIKES {created_at: datetime(like.created_at)}]->(p)
+        WITH p, count(*) AS added
+        SET p.likes_count = coalesce(p.likes_count, 0) + added
+        RETURN p.post_id AS post_id, p.likes_count AS likes_count,
+               p.comments_count AS comments_count,
+               p.created_at AS post_created_at
+        """
+
+        return await run_write(self.session, query, likes=likes)
+
+    async def write_unlikes(self, unlikes: List[dict]) -> List[Record]:
+        query = """
+        UNWIND $unlikes AS unlike
+        MATCH (u:User {user_id: unlike.user_id})-[r:LIKES]->(p:Post {post_id: unlike.post_id})
+        DELETE r
+        WITH p, count(*) AS removed
+        SET p.likes_count = coalesce(p.likes_count, removed) - removed
+        RETURN p.post_id AS post_id, p.likes_count AS likes_count,
+               p.comments_count AS comments_count,
+               p.created_at AS post_created_at
+        """
+
+        return await run_write(self.session, query, unlikes=unlikes)
+
+
+class LikeBuffer:
+    """Coalesces like/unlike intents and writes them in batches.
+
+    ``accepting`` turns false once four times ``max_size`` intents are
+    pending, e.g. while the database is down; callers then write
+    synchronously so the backlog cannot grow without bound.
+    """
+
+    def __init__(self, enabled: bool, flush_interval: float, max_size: int):
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self._pending: Intents = {}
+        self._flushing: Intents = {}
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        self.accepted = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.written = 0
+        self.flush_seconds_total = 0.0
+
+    @property
+    def accepting(self) -> bool:
+        return self._task is not None and (
+            len(self._pending) < 4 * self.max_size
+        )
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        # Not cancelled: a flush interrupted mid-write would lose intents.
+        self._closing = True
+        self._wake.set()
+        await task
+        while self._pending:
+            if not await self.flush():
+                logger.error(
+                    f"Dropping {len(self._pending)} buffered like intents"
+                )
+                break
+
+    def add(self, user_id: str, post_id: str, liked: bool) -> None:
+        key = (user_id, post_id)
+        if key in self._pending:
+            self.coalesced += 1
+        self._pending[key] = (liked, datetime.now(timezone.utc).isoformat())
+        self.accepted += 1
+        if len(self._pending) >= self.max_size:
+            self._wake.set()
+
+    def pending_state(self, user_id: str, post_id: str) -> Optional[bool]:
+        """The user's unwritten intent for the post, if any."""
+        key = (user_id, post_id)
+        intent = self._pending.get(key) or self._flushing.get(key)
+        return None if intent is None else intent[0]
+
+    def overlay(self, user_id: str, post: PostResponse) -> PostResponse:
+        liked = self.pending_state(user_id, post.post_id)
+        if liked is None or liked == post.is_liked:
+            return post
+        delta = 1 if liked else -1
+        return post.model_copy(
+            update={
+                "is_liked": liked,
+                "likes_count": max(0, post.likes_count + delta),
+            }
+        )
+
+    async def flush(self) -> bool:
+        """Write every pending intent; return ``False`` if that failed.
+
+        Failed intents go back into the buffer unless the user has changed
+        their mind since.
+        """
+        async with self._lock:
+            if not self._pending:
+                return True
+            self._flushing, self._pending = self._pending, {}
+            likes, unlikes = [], []
+            for (user_id, post_id), (
+                liked,
+                created_at,
+            ) in self._flushing.items():
+                intent = {"user_id": user_id, "post_id": post_id}
+                if liked:
+                    likes.append({**intent, "created_at": created_at})
+                else:
+                    unlikes.append(intent)
+
+            started = time.perf_counter()
+            try:
+                records = []
+                async with neo4j_connection.session() as session:
+                    service = LikeBufferService(session)
+                    if likes:
+                        records += await service.write_likes(likes)
+                    if unlikes:
+                        records += await service.write_unlikes(unlikes)
+            except Exception as e:
+                self.failed_flushes += 1
+                logger.warning(f"Like buffer flush failed: {e}")
+                self._pending = {**self._flushing, **self._pending}
+                return False
+            finally:
+                self._flushing = {}
+
+            for record in records:
+                post_cache.delete(record["post_id"])
+                post_scores.update(
+                    record["post_id"],
+                    record["likes_count"],
+                    record["comments_count"],
+                    record["post_created_at"],
+                )
+            self.flushes += 1
+            self.written += len(likes) + len(unlikes)
+            self.flush_seconds_total += time.perf_counter() - started
+            return True
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(
+                    self._wake.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    def metrics(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._pending),
+            "accepted": self.accepted,
+            "coalesced": self.coalesced,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "written": self.written,
+            "flush_seconds_total": self.flush_seconds_total,
+        }
+
+
+like_buffer = LikeBuffer(
+    enabled=settings.like_buffer_enabled,
+    flush_interval=settings.like_buffer_flush_ms / 1000,
+    max_size=settings.like_buffer_max_size,
+)
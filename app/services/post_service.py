@@ -3,13 +3,37 @@ from app.models.post import (
     PostCreate,
     PostResponse,
     CommentCreate,
+    CommentPage,
     CommentResponse,
     UnlikePostResponse,
 )
+from app.config import settings
+from app.utils.cache import post_cache
+from app.utils.feed_store import (
+    FeedEntry,
+    author_rings,
+    feed_store,
+    is_pulled_author,
+)
+from app.utils.neo4j_helpers import (
+    first,
+    run_read,
+    run_write,
+    stream_read,
+)
+from app.utils.pagination import cursor_datetime, decode_cursor, paginate
+from app.services.feed_ranking import post_scores
+from app.services.like_buffer import like_buffer
+from app.services.projections import (
+    comment_projection,
+    post_projection,
+    to_comment,
+    to_post,
+)
 from neo4j import AsyncSession
 from datetime import datetime, timezone
 import uuid
-from typing import Optional, List
+from typing import AsyncIterator, Dict, List, Optional
 
 
 class PostService:
@@ -23,129 +47,259 @@ class PostService:
         post_id = str(uuid.uuid4())
         created_at = datetime.now(timezone.utc).isoformat()
 
-        query = """
-        MATCH (u:User {user_id: $user_id})
+        query = f"""
+        MATCH (u:User {{user_id: $user_id}})
 
-        CREATE (p:Post {
+        CREATE (p:Post {{
             post_id: $post_id,
             content: $content,
             image_url: $image_url,
             author_id: $user_id,
             author_username: u.username,
-            created_at: datetime($created_at)
-        })
-
-        CREATE (u)-[:POSTED {created_at: datetime($created_at)}]->(p)
-        RETURN p, u.user_id AS author_id, u.username AS author_username
+            created_at: datetime($created_at),
+            likes_count: 0,
+            comments_count: 0
+        }})
+
+        CREATE (u)-[:POSTED {{created_at: datetime($created_at)}}]->(p)
+        WITH p, u
+        CALL {{
+            WITH u
+            WITH u
+            WHERE $pull_threshold IS NULL
+                  OR coalesce(u.follower_count, 0) < $pull_threshold
+            MATCH (follower:User)-[:FOLLOWS]->(u)
+            RETURN collect(follower.user_id) AS follower_ids
+        }}
+        RETURN {post_projection("p", "u")} AS post,
+               u.follower_count AS follower_count, follower_ids
         """
 
-        result = await self.session.run(
+        records = await run_write(
+            self.session,
             query,
             user_id=user_id,
             post_id=post_id,
             content=post_create.content,
             image_url=post_create.image_url,
             created_at=created_at,
+            pull_threshold=settings.feed_pull_follower_threshold or None,
         )
 
-        record = await result.single()
-        post_node = record["p"]
-
-        return PostResponse(
-            post_id=post_node["post_id"],
-            content=post_node["content"],
-            image_url=post_node.get("image_url"),
-            author_id=record["author_id"],
-            author_username=record["author_username"],
-            created_at=post_node["created_at"],
-            likes_count=0,
-            comments_count=0,
-            is_liked=False,
+        record = first(records)
+
+        # Followers of a pulled author read the post from its ring; the
+        # write query skipped collecting their ids.
+        entry = FeedEntry(
+            post_id=post_id,
+            author_id=user_id,
+            created_at=datetime.fromisoformat(created_at),
         )
+        await feed_store.push([user_id, *record["follower_ids"]], entry)
+        if is_pulled_author(record["follower_count"]):
+            author_rings.push(user_id, entry)
+
+        return to_post(record["post"])
 
     async def get_post(
         self, post_id: str, current_user_id: Optional[str] = None
     ) -> Optional[PostResponse]:
-        query = """
-        MATCH (u:User)-[:POSTED]->(p:Post {post_id: $post_id})
-
-        OPTIONAL MATCH (liker:User)-[:LIKES]->(p)
-        WITH p, u, COUNT(DISTINCT liker) AS likes_count
-
-        OPTIONAL MATCH (p)<-[:COMMENTED_ON]-(c:Comment)
-        WITH p, u, likes_count, COUNT(DISTINCT c) AS comments_count
-
-        OPTIONAL MATCH (current_user:User {user_id: $current_user_id})-[like:LIKES]->(p)
-
-        RETURN p, u.user_id AS author_id, u.username AS author_username, likes_count, comments_count, like IS NOT NULL AS is_liked
-
+        post = post_cache.get(post_id)
+        if post is None:
+            post = await self._load_post(post_id)
+            if post is None:
+                return None
+            post_cache.set(post_id, post)
+
+        if current_user_id is None:
+            return post
+        # is_liked is per viewer, so it is layered onto a copy of the
+        # shared cached body rather than cached with it.
+        is_liked = await self._is_liked(current_user_id, post_id)
+        post = post.model_copy(update={"is_liked": is_liked})
+        return like_buffer.overlay(current_user_id, post)
+
+    async def _load_post(self, post_id: str) -> Optional[PostResponse]:
+        query = f"""
+        MATCH (u:User)-[:POSTED]->(p:Post {{post_id: $post_id}})
+
+        RETURN {post_projection("p", "u")} AS post
         """
 
-        result = await self.session.run(
-            query, post_id=post_id, current_user_id=current_user_id
-        )
+        records = await run_read(self.session, query, post_id=post_id)
 
-        record = await result.single()
+        record = first(records)
         if not record:
             return None
 
-        post_node = record["p"]
-        return PostResponse(
-            post_id=post_node["post_id"],
-            content=post_node["content"],
-            image_url=post_node.get("image_url"),
-            author_id=record["author_id"],
-            author_username=record["author_username"],
-            created_at=post_node["created_at"],
-            likes_count=record["likes_count"],
-            comments_count=record["comments_count"],
-            is_liked=record["is_liked"],
+        return to_post(record["post"])
+
+    async def _is_liked(self, user_id: str, post_id: str) -> bool:
+        query = """
+        MATCH (u:User {user_id: $user_id})-[:LIKES]->(p:Post {post_id: $post_id})
+        RETURN count(*) > 0 AS is_liked
+        """
+
+        records = await run_read(
+            self.session, query, user_id=user_id, post_id=post_id
         )
+        record = first(records)
+        return bool(record and record["is_liked"])
 
     async def like_post(self, user_id: str, post_id: str) -> LikePostResponse:
+        (response,) = await self.like_posts(user_id, [post_id])
+        return response
+
+    async def like_posts(
+        self, user_id: str, post_ids: List[str]
+    ) -> List[LikePostResponse]:
+        """Like many posts in one transaction, reporting per-item results."""
+        post_ids = list(dict.fromkeys(post_ids))
+        created_at = datetime.now(timezone.utc).isoformat()
+        if like_buffer.accepting:
+            states = await self._buffer_intents(user_id, post_ids, True)
+            return [
+                LikePostResponse(
+                    post_id=post_id,
+                    user_id=user_id,
+                    created_at=created_at,
+                    success=post_id in states,
+                    error=None if post_id in states else "Post not found",
+                )
+                for post_id in post_ids
+            ]
+
         query = """
         MATCH (u:User {user_id: $user_id})
-        MATCH (p:Post {post_id: $post_id})
+        UNWIND $post_ids AS post_id
+        MATCH (p:Post {post_id: post_id})
 
         MERGE (u)-[r:LIKES]->(p)
-        ON CREATE SET r.created_at = datetime($created_at)
-        RETURN r
+        ON CREATE SET r.created_at = datetime($created_at),
+                      p.likes_count = coalesce(p.likes_count, 0) + 1
+        RETURN p.post_id AS post_id, p.likes_count AS likes_count,
+               p.comments_count AS comments_count,
+               p.created_at AS post_created_at
         """
-        result = await self.session.run(
+        records = await run_write(
+            self.session,
             query,
-            post_id=post_id,
+            post_ids=post_ids,
             user_id=user_id,
-            created_at=datetime.now(timezone.utc).isoformat(),
+            created_at=created_at,
         )
 
-        record = await result.single()
-        return LikePostResponse(
-            post_id=post_id,
-            user_id=user_id,
-            created_at=datetime.now(timezone.utc).isoformat(),
-            success=record is not None,
+        liked = {record["post_id"] for record in records}
+        for record in records:
+            post_cache.delete(record["post_id"])
+            self._update_score(record)
+
+        return [
+            LikePostResponse(
+                post_id=post_id,
+                user_id=user_id,
+                created_at=created_at,
+                success=post_id in liked,
+                error=None if post_id in liked else "Post not found",
+            )
+            for post_id in post_ids
+        ]
+
+    async def _buffer_intents(
+        self, user_id: str, post_ids: List[str], liked: bool
+    ) -> Dict[str, bool]:
+        """Queue like or unlike intents in ``like_buffer``.
+
+        Returns whether each existing post was liked before this call,
+        counting the user's pending intents. Missing posts are left out
+        and not queued, and neither are unlikes of posts not liked.
+        """
+        query = """
+        MATCH (u:User {user_id: $user_id})
+        UNWIND $post_ids AS post_id
+        MATCH (p:Post {post_id: post_id})
+        RETURN p.post_id AS post_id, EXISTS { (u)-[:LIKES]->(p) } AS is_liked
+        """
+
+        records = await run_read(
+            self.session, query, user_id=user_id, post_ids=post_ids
+        )
+
+        states = {}
+        for record in records:
+            post_id = record["post_id"]
+            pending = like_buffer.pending_state(user_id, post_id)
+            states[post_id] = (
+                record["is_liked"] if pending is None else pending
+            )
+            if liked or states[post_id]:
+                like_buffer.add(user_id, post_id, liked)
+        return states
+
+    @staticmethod
+    def _update_score(record) -> None:
+        post_scores.update(
+            record["post_id"],
+            record["likes_count"],
+            record["comments_count"],
+            record["post_created_at"],
         )
 
     async def unlike_post(
         self, user_id: str, post_id: str
     ) -> UnlikePostResponse:
+        (response,) = await self.unlike_posts(user_id, [post_id])
+        return response
+
+    async def unlike_posts(
+        self, user_id: str, post_ids: List[str]
+    ) -> List[UnlikePostResponse]:
+        """Unlike many posts in one transaction."""
+        post_ids = list(dict.fromkeys(post_ids))
+        if like_buffer.accepting:
+            states = await self._buffer_intents(user_id, post_ids, False)
+            created_at = datetime.now(timezone.utc).isoformat()
+            return [
+                UnlikePostResponse(
+                    post_id=post_id,
+                    user_id=user_id,
+                    created_at=created_at,
+                    success=states.get(post_id, False),
+                    error=(None if states.get(post_id) else "Post not liked"),
+                )
+                for post_id in post_ids
+            ]
+
         query = """
-        MATCH (u:User {user_id: $user_id})-[r:LIKES]->(p:Post {post_id: $post_id})
+        MATCH (u:User {user_id: $user_id})
+        UNWIND $post_ids AS post_id
+        MATCH (u)-[r:LIKES]->(p:Post {post_id: post_id})
         DELETE r
-        RETURN COUNT(r) AS deleted_count
+        SET p.likes_count = coalesce(p.likes_count, 1) - 1
+        RETURN p.post_id AS post_id, p.likes_count AS likes_count,
+               p.comments_count AS comments_count,
+               p.created_at AS post_created_at
         """
-        result = await self.session.run(
-            query, post_id=post_id, user_id=user_id
+        records = await run_write(
+            self.session, query, post_ids=post_ids, user_id=user_id
         )
 
-        record = await result.single()
-        deleted = record["deleted_count"] > 0 if record else False
-        return UnlikePostResponse(
-            post_id=post_id,
-            user_id=user_id,
-            created_at=datetime.now(timezone.utc).isoformat(),
-            success=deleted,
-        )
+        unliked = {record["post_id"] for record in records}
+        for record in records:
+            post_cache.delete(record["post_id"])
+            self._update_score(record)
+
+        created_at = datetime.now(timezone.utc).isoformat()
+        return [
+            UnlikePostResponse(
+                post_id=post_id,
+                user_id=user_id,
+                created_at=created_at,
+                success=post_id in unliked,
+                error=None if post_id in unliked else "Post not liked",
+            )
+            for post_id in post_ids
+        ]
 
     async def create_comment(
         self, user_id: str, post_id: str, comment_create: CommentCreate
@@ -153,23 +307,28 @@ class PostService:
         comment_id = str(uuid.uuid4())
         created_at = datetime.now(timezone.utc).isoformat()
 
-        query = """
-        MATCH (u:User {user_id: $user_id})
-        MATCH (p:Post {post_id: $post_id})
+        query = f"""
+        MATCH (u:User {{user_id: $user_id}})
+        MATCH (p:Post {{post_id: $post_id}})
 
-        CREATE (c: Comment {
+        CREATE (c: Comment {{
             comment_id: $comment_id,
             content: $content,
             author_id: $user_id,
             author_username: u.username,
             created_at: datetime($created_at)
-        })
+        }})
 
         CREATE (u)-[:COMMENTED]->(c)
         CREATE (c)-[:COMMENTED_ON]->(p)
-        RETURN c, u.user_id AS author_id, u.username AS author_username
+        SET p.comments_count = coalesce(p.comments_count, 0) + 1
+        RETURN {comment_projection("c", "u")} AS comment,
+               p.post_id AS post_id, p.likes_count AS likes_count,
+               p.comments_count AS comments_count,
+               p.created_at AS post_created_at
         """
-        result = await self.session.run(
+        records = await run_write(
+            self.session,
             query,
             comment_id=comment_id,
             content=comment_create.content,
@@ -178,46 +337,65 @@ class PostService:
             created_at=created_at,
         )
 
-        record = await result.single()
+        record = first(records)
         if not record:
             raise ValueError("Failed to create comment")
+        post_cache.delete(post_id)
+        self._update_score(record)
 
-        comment_node = record["c"]
-        return CommentResponse(
-            comment_id=comment_node["comment_id"],
-            content=comment_node["content"],
-            author_id=record["author_id"],
-            author_username=record["author_username"],
-            created_at=comment_node["created_at"],
-        )
+        return to_comment(record["comment"])
 
     async def get_post_comments(
-        self, post_id: str, limit: int = 50
-    ) -> List[CommentResponse]:
-        query = """
-        MATCH (p:Post {post_id: $post_id})<-[:COMMENTED_ON]-(c:Comment)
+        self, post_id: str, limit: int = 50, cursor: Optional[str] = None
+    ) -> CommentPage:
+        after = decode_cursor(cursor, 2) or [None, None]
+        if after[0] is not None:
+            # Parsed here so a bad cursor is a 400, not a Cypher error.
+            after[0] = cursor_datetime(after[0])
+
+        query = f"""
+        MATCH (p:Post {{post_id: $post_id}})<-[:COMMENTED_ON]-(c:Comment)
+        WHERE $after_created_at IS NULL
+              OR c.created_at < $after_created_at
+              OR (c.created_at = $after_created_at
+                  AND c.comment_id < $after_id)
         MATCH (u:User)-[:COMMENTED]->(c)
 
-        RETURN c, u.user_id AS author_id, u.username AS author_username
-        ORDER BY c.created_at DESC
+        RETURN {comment_projection("c", "u")} AS comment
+        ORDER BY c.created_at DESC, c.comment_id DESC
         LIMIT $limit
         """
 
-        result = await self.session.run(query, post_id=post_id, limit=limit)
-
-        comments = []
-        async for record in result:
-            comment_node = record["c"]
-            comments.append(
-                CommentResponse(
-                    comment_id=comment_node["comment_id"],
-                    content=comment_node["content"],
-                    author_id=record["author_id"],
-                    author_username=record["author_username"],
-                    created_at=comment_node["created_at"],
-                )
-            )
-        return comments
+        records = await run_read(
+            self.session,
+            query,
+            post_id=post_id,
+            after_created_at=after[0],
+            after_id=after[1],
+            limit=limit + 1,
+        )
+
+        comments = [to_comment(record["comment"]) for record in records]
+
+        items, next_cursor = paginate(
+            comments, limit, lambda c: (c.created_at, c.comment_id)
+        )
+        return CommentPage.model_construct(
+            items=items, next_cursor=next_cursor
+        )
+
+    async def stream_user_posts(
+        self, user_id: str
+    ) -> AsyncIterator[PostResponse]:
+        """Every post by ``user_id``, newest first."""
+        query = f"""
+        MATCH (u:User {{user_id: $user_id}})-[:POSTED]->(p:Post)
+        RETURN {post_projection("p", "u")} AS post
+        ORDER BY p.created_at DESC
+        """
+
+        async for record in stream_read(self.session, query, user_id=user_id):
+            yield to_post(record["post"])
 
     async def delete_post(self, user_id: str, post_id: str) -> bool:
         query = """
@@ -225,11 +403,12 @@ class PostService:
         DETACH DELETE p
         RETURN COUNT(p) AS deleted_count
         """
-        result = await self.session.run(
-            query, post_id=post_id, user_id=user_id
+        records = await run_write(
+            self.session, query, post_id=post_id, user_id=user_id
         )
 
-        record = await result.single()
+        record = first(records)
+        post_cache.delete(post_id)
         if not record:
             return False
 
@@ -0,0 +1,79 @@
+"""Cypher projections and record mappers shared by the services.
+
+Read queries return a map projection per row holding exactly the fields
+the response model needs, rather than whole nodes; returning ``u`` would
+also ship ``password_hash`` and any other stored property over Bolt. The
+``to_*`` mappers turn those maps into response models with
+``model_construct``, converting ``created_at`` once.
+
+Each projection takes the Cypher variable names to project from, e.g.
+``RETURN {user_projection("follower")} AS user``.
+"""
+
+from app.models.post import CommentResponse, PostResponse
+from app.models.user import UserResponse
+from app.utils.neo4j_helpers import to_python_datetime
+
+
+def user_projection(user: str) -> str:
+    return (
+        f"{user} {{.user_id, .email, .username, .full_name, .bio, "
+        f".created_at, "
+        f"follower_count: coalesce({user}.follower_count, 0), "
+        f"following_count: coalesce({user}.following_count, 0)}}"
+    )
+
+
+def post_projection(post: str, author: str) -> str:
+    return (
+        f"{post} {{.post_id, .content, .image_url, .created_at, "
+        f"author_id: {author}.user_id, "
+        f"author_username: {author}.username, "
+        f"likes_count: coalesce({post}.likes_count, 0), "
+        f"comments_count: coalesce({post}.comments_count, 0)}}"
+    )
+
+
+def comment_projection(comment: str, author: str) -> str:
+    return (
+        f"{comment} {{.comment_id, .content, .created_at, "
+        f"author_id: {author}.user_id, "
+        f"author_username: {author}.username}}"
+    )
+
+
+def to_user(row: dict) -> UserResponse:
+    return UserResponse.model_construct(
+        user_id=row["user_id"],
+        email=row["email"],
+        username=row["username"],
+        full_name=row["full_name"],
+        bio=row["bio"],
+        created_at=to_python_datetime(row["created_at"]),
+        follower_count=row["follower_count"],
+        following_count=row["following_count"],
+    )
+
+
+def to_post(row: dict, is_liked: bool = False) -> PostResponse:
+    return PostResponse.model_construct(
+        post_id=row["post_id"],
+        content=row["content"],
+        image_url=row["image_url"],
+        author_id=row["author_id"],
+        author_username=row["author_username"],
+        created_at=to_python_datetime(row["created_at"]),
+        likes_count=row["likes_count"],
+        comments_count=row["comments_count"],
+        is_liked=is_liked,
+    )
+
+
+def to_comment(row: dict) -> CommentResponse:
+    return CommentResponse.model_construct(
+        comment_id=row["comment_id"],
+        content=row["content"],
+        author_id=row["author_id"],
+        author_username=row["author_username"],
+        created_at=to_python_datetime(row["created_at"]),
+    )
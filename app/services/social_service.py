@@ -1,9 +1,55 @@
+import itertools
+import time
 from neo4j import AsyncSession
 from datetime import datetime, timezone
-from typing import Optional, List
-from app.models.user import UserResponse
-from app.models.post import PostResponse
-from app.models.social import FollowResponse, UnfollowResponse
+from typing import AsyncIterator, Deque, Dict, Optional, List
+from app.config import settings
+from app.models.user import UserPage, UserResponse
+from app.models.post import PostPage
+from app.models.social import (
+    FollowResponse,
+    MutualFollowersCount,
+    UnfollowResponse,
+)
+from app.utils.cache import (
+    mutual_count_cache,
+    profile_cache,
+    pulled_authors_cache,
+)
+from app.utils.feed_store import (
+    FeedEntry,
+    author_rings,
+    feed_store,
+    merge_sources,
+)
+from app.utils.metrics import Histogram, registry
+from app.utils.neo4j_helpers import (
+    run_read,
+    run_write,
+    stream_read,
+    to_python_datetime,
+)
+from app.utils.pagination import cursor_datetime, decode_cursor, paginate
+from app.services.feed_ranking import post_scores
+from app.services.like_buffer import like_buffer
+from app.services.suggestion_service import (
+    SuggestionService,
+    suggestion_engine,
+)
+from app.services.projections import (
+    post_projection,
+    to_post,
+    to_user,
+    user_projection,
+)
+
+feed_source_duration = registry.register(
+    Histogram(
+        "feed_source_duration_seconds",
+        "Time to read the pushed inbox, pull author rings, and merge them.",
+        ["source"],
+    )
+)
 
 
 class SocialService:
@@ -15,263 +61,538 @@ class SocialService:
         if follower_id == following_id:
             raise ValueError("You cannot follow yourself")
 
+        (response,) = await self.follow_users(follower_id, [following_id])
+        return response
+
+    async def follow_users(
+        self, follower_id: str, following_ids: List[str]
+    ) -> List[FollowResponse]:
+        """Follow many users in one transaction, reporting per-item results."""
+        following_ids = list(dict.fromkeys(following_ids))
         created_at = datetime.now(timezone.utc).isoformat()
 
         query = """
         MATCH (follower: User {user_id: $follower_id})
-        MATCH (following: User {user_id: $following_id})
+        UNWIND $following_ids AS following_id
+        MATCH (following: User {user_id: following_id})
 
         MERGE (follower)-[r:FOLLOWS]->(following)
-        ON CREATE SET r.created_at = datetime($created_at)
-        return r
+        ON CREATE SET r.created_at = datetime($created_at),
+            follower.following_count = coalesce(follower.following_count, 0) + 1,
+            following.follower_count = coalesce(following.follower_count, 0) + 1
+        RETURN following.user_id AS following_id,
+               r.created_at = datetime($created_at) AS created
         """
 
-        result = await self.session.run(
+        records = await run_write(
+            self.session,
             query,
             follower_id=follower_id,
-            following_id=following_id,
+            following_ids=[f for f in following_ids if f != follower_id],
             created_at=created_at,
         )
 
-        record = await result.single()
-        return FollowResponse(
-            follower_id=follower_id,
-            followed_id=following_id,
-            created_at=created_at,
-            success=record is not None,
+        followed = {record["following_id"]: record for record in records}
+        profile_cache.delete(follower_id)
+        pulled_authors_cache.delete(follower_id)
+        if any(record["created"] for record in followed.values()):
+            suggestion_engine.mark_stale(follower_id)
+        for following_id in followed:
+            profile_cache.delete(following_id)
+        await self._backfill_feed(
+            follower_id,
+            [f for f, record in followed.items() if record["created"]],
         )
 
+        responses = []
+        for following_id in following_ids:
+            error = None
+            if following_id == follower_id:
+                error = "You cannot follow yourself"
+            elif following_id not in followed:
+                error = "User not found"
+            responses.append(
+                FollowResponse(
+                    follower_id=follower_id,
+                    followed_id=following_id,
+                    created_at=created_at,
+                    success=error is None,
+                    error=error,
+                )
+            )
+        return responses
+
     async def unfollow_user(self, follower_id: str, following_id: str) -> bool:
         if follower_id == following_id:
             raise ValueError("You cannot unfollow yourself")
 
+        (response,) = await self.unfollow_users(follower_id, [following_id])
+        return response
+
+    async def unfollow_users(
+        self, follower_id: str, following_ids: List[str]
+    ) -> List[UnfollowResponse]:
+        """Unfollow many users in one transaction."""
+        following_ids = list(dict.fromkeys(following_ids))
+
         query = """
-        MATCH (follower: User {user_id: $follower_id})-[r:FOLLOWS]->(following: User {user_id: $following_id})
+        MATCH (follower: User {user_id: $follower_id})
+        UNWIND $following_ids AS following_id
+        MATCH (follower)-[r:FOLLOWS]->(following: User {user_id: following_id})
         DELETE r
-        RETURN count(r) AS deleted_count
+        SET follower.following_count = coalesce(follower.following_count, 1) - 1,
+            following.follower_count = coalesce(following.follower_count, 1) - 1
+        RETURN following.user_id AS following_id
         """
 
-        result = await self.session.run(
+        records = await run_write(
+            self.session,
             query,
             follower_id=follower_id,
-            following_id=following_id,
+            following_ids=[f for f in following_ids if f != follower_id],
         )
 
-        record = await result.single()
-        return UnfollowResponse(
-            follower_id=follower_id,
-            followed_id=following_id,
-            created_at=datetime.now(timezone.utc).isoformat(),
-            success=record["deleted_count"] > 0,
-        )
+        unfollowed = {record["following_id"] for record in records}
+        profile_cache.delete(follower_id)
+        pulled_authors_cache.delete(follower_id)
+        if unfollowed:
+            suggestion_engine.mark_stale(follower_id)
+        for following_id in unfollowed:
+            profile_cache.delete(following_id)
+            await feed_store.prune_author(follower_id, following_id)
 
-    async def get_followers(
-        self, user_id: str, limit: int = 50
-    ) -> List[UserResponse]:
-        query = """
-        MATCH (follower: User)-[:FOLLOWS]->(u:User {user_id: $user_id})
+        created_at = datetime.now(timezone.utc).isoformat()
+        responses = []
+        for following_id in following_ids:
+            error = None
+            if following_id == follower_id:
+                error = "You cannot unfollow yourself"
+            elif following_id not in unfollowed:
+                error = "Not following this user"
+            responses.append(
+                UnfollowResponse(
+                    follower_id=follower_id,
+                    followed_id=following_id,
+                    created_at=created_at,
+                    success=error is None,
+                    error=error,
+                )
+            )
+        return responses
 
-        OPTIONAL MATCH (follower)-[:FOLLOWS]->(following)
-        WITH follower, COUNT(DISTINCT following) AS following_count
+    async def _backfill_feed(self, follower_id: str, author_ids: List[str]):
+        if not author_ids or not await feed_store.is_materialized(follower_id):
+            return
 
-        OPTIONAL MATCH (f:User)-[:FOLLOWS]->(follower)
-        WITH follower, following_count, COUNT(DISTINCT f) AS follower_count
+        entries = await self._recent_posts(
+            author_ids, feed_store.max_size, pushed_only=True
+        )
+        await feed_store.backfill(follower_id, entries)
 
-        RETURN follower, following_count, follower_count
-        ORDER BY follower.username
-        LIMIT $limit
+    async def _recent_posts(
+        self, author_ids: List[str], limit: int, pushed_only: bool = False
+    ) -> List[FeedEntry]:
+        """The newest ``limit`` posts of each author.
+
+        ``pushed_only`` skips pulled authors, whose posts never belong in
+        an inbox.
+        """
+        query = """
+        UNWIND $author_ids AS author_id
+        MATCH (author:User {user_id: author_id})
+        WHERE $pull_threshold IS NULL
+              OR coalesce(author.follower_count, 0) < $pull_threshold
+        CALL {
+            WITH author
+            MATCH (author)-[:POSTED]->(p:Post)
+            RETURN p
+            ORDER BY p.created_at DESC
+            LIMIT $limit
+        }
+        RETURN p.post_id AS post_id, author_id, p.created_at AS created_at
         """
 
-        result = await self.session.run(
+        records = await run_read(
+            self.session,
             query,
-            user_id=user_id,
+            author_ids=author_ids,
             limit=limit,
+            pull_threshold=(
+                settings.feed_pull_follower_threshold or None
+                if pushed_only
+                else None
+            ),
         )
 
-        followers = []
-
-        async for record in result:
-            user_node = record["follower"]
-            followers.append(
-                UserResponse(
-                    user_id=user_node["user_id"],
-                    email=user_node["email"],
-                    username=user_node["username"],
-                    full_name=user_node["full_name"],
-                    bio=user_node["bio"],
-                    created_at=user_node["created_at"],
-                    follower_count=record["follower_count"],
-                    following_count=record["following_count"],
-                )
+        return [
+            FeedEntry(
+                post_id=record["post_id"],
+                author_id=record["author_id"],
+                created_at=to_python_datetime(record["created_at"]),
             )
+            for record in records
+        ]
 
-        return followers
+    async def get_followers(
+        self, user_id: str, limit: int = 50, cursor: Optional[str] = None
+    ) -> UserPage:
+        after = decode_cursor(cursor, 2) or [None, None]
+
+        query = f"""
+        MATCH (follower: User)-[:FOLLOWS]->(u:User {{user_id: $user_id}})
+        WHERE $after_username IS NULL
+              OR follower.username > $after_username
+              OR (follower.username = $after_username
+                  AND follower.user_id > $after_id)
+
+        RETURN {user_projection("follower")} AS user
+        ORDER BY follower.username, follower.user_id
+        LIMIT $limit
+        """
 
-    async def get_following(
-        self, user_id: str, limit: int = 50
-    ) -> List[UserResponse]:
-        query = """
-        MATCH (u:User {user_id: $user_id})-[:FOLLOWS]->(following:User)
+        records = await run_read(
+            self.session,
+            query,
+            user_id=user_id,
+            after_username=after[0],
+            after_id=after[1],
+            limit=limit + 1,
+        )
 
-        OPTIONAL MATCH (following)-[:FOLLOWS]->(follower)
-        WITH following, COUNT(DISTINCT follower) AS follower_count
+        followers = [to_user(record["user"]) for record in records]
 
-        OPTIONAL MATCH (f:User)-[:FOLLOWS]->(following)
-        WITH following, follower_count, COUNT(DISTINCT f) AS following_count
+        items, next_cursor = paginate(
+            followers, limit, lambda u: (u.username, u.user_id)
+        )
+        return UserPage.model_construct(items=items, next_cursor=next_cursor)
 
-        RETURN following, follower_count, following_count
-        ORDER BY following.username
+    async def get_following(
+        self, user_id: str, limit: int = 50, cursor: Optional[str] = None
+    ) -> UserPage:
+        after = decode_cursor(cursor, 2) or [None, None]
+
+        query = f"""
+        MATCH (u:User {{user_id: $user_id}})-[:FOLLOWS]->(following:User)
+        WHERE $after_username IS NULL
+              OR following.username > $after_username
+              OR (following.username = $after_username
+                  AND following.user_id > $after_id)
+
+        RETURN {user_projection("following")} AS user
+        ORDER BY following.username, following.user_id
         LIMIT $limit
         """
 
-        result = await self.session.run(
+        records = await run_read(
+            self.session,
             query,
             user_id=user_id,
-            limit=limit,
+            after_username=after[0],
+            after_id=after[1],
+            limit=limit + 1,
         )
 
-        following = []
-        async for record in result:
-            user_node = record["following"]
-            following.append(
-                UserResponse(
-                    user_id=user_node["user_id"],
-                    email=user_node["email"],
-                    username=user_node["username"],
-                    full_name=user_node["full_name"],
-                    bio=user_node["bio"],
-                    created_at=user_node["created_at"],
-                    follower_count=record["follower_count"],
-                    following_count=record["following_count"],
-                )
-            )
+        following = [to_user(record["user"]) for record in records]
 
-        return following
+        items, next_cursor = paginate(
+            following, limit, lambda u: (u.username, u.user_id)
+        )
+        return UserPage.model_construct(items=items, next_cursor=next_cursor)
 
-    async def get_mutual_followers(
-        self, user1_id: str, user2_id: str
-    ) -> List[UserResponse]:
-        query = """
-        MATCH (mutual: User)-[:FOLLOWS]->(u1:User {user_id: $user1_id})
-        MATCH (mutual)-[:FOLLOWS]->(u2:User {user_id: $user2_id})
+    async def stream_followers(
+        self, user_id: str
+    ) -> AsyncIterator[UserResponse]:
+        """Every follower of ``user_id``, in no particular order.
+
+        Unordered so that the server can stream rows as it finds them
+        instead of sorting the whole follower set first.
+        """
+        query = f"""
+        MATCH (follower: User)-[:FOLLOWS]->(u:User {{user_id: $user_id}})
+        RETURN {user_projection("follower")} AS user
+        """
+
+        async for record in stream_read(self.session, query, user_id=user_id):
+            yield to_user(record["user"])
+
+    async def stream_following(
+        self, user_id: str
+    ) -> AsyncIterator[UserResponse]:
+        """Every user ``user_id`` follows, in no particular order."""
+        query = f"""
+        MATCH (u:User {{user_id: $user_id}})-[:FOLLOWS]->(following:User)
+        RETURN {user_projection("following")} AS user
+        """
+
+        async for record in stream_read(self.session, query, user_id=user_id):
+            yield to_user(record["user"])
+
+    # Binds the endpoint with fewer followers to ``small`` and the other to
+    # ``big``. The intersection expands the followers of ``small`` and
+    # probes each for an edge to ``big``, so comparing two celebrities
+    # costs the smaller follower count rather than the product of both.
+    _MUTUAL_PAIR = """
+        MATCH (u1:User {user_id: $user1_id}), (u2:User {user_id: $user2_id})
         WHERE u1 <> u2
-        RETURN DISTINCT mutual
-        ORDER BY mutual.username
+        WITH CASE
+                 WHEN coalesce(u1.follower_count, 0)
+                      <= coalesce(u2.follower_count, 0)
+                 THEN [u1, u2] ELSE [u2, u1]
+             END AS pair
+        WITH pair[0] AS small, pair[1] AS big
+        MATCH (mutual:User)-[:FOLLOWS]->(small)
+        WHERE (mutual)-[:FOLLOWS]->(big)
+        """
+
+    async def get_mutual_followers(
+        self,
+        user1_id: str,
+        user2_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> UserPage:
+        after = decode_cursor(cursor, 2) or [None, None]
+
+        query = f"""
+        {self._MUTUAL_PAIR}
+        WITH mutual
+        WHERE $after_username IS NULL
+              OR mutual.username > $after_username
+              OR (mutual.username = $after_username
+                  AND mutual.user_id > $after_id)
+
+        RETURN {user_projection("mutual")} AS user
+        ORDER BY mutual.username, mutual.user_id
+        LIMIT $limit
         """
 
-        result = await self.session.run(
+        records = await run_read(
+            self.session,
             query,
             user1_id=user1_id,
             user2_id=user2_id,
+            after_username=after[0],
+            after_id=after[1],
+            limit=limit + 1,
         )
 
-        mutual_followers = []
-        async for record in result:
-            user_node = record["mutual"]
-            mutual_followers.append(
-                UserResponse(
-                    user_id=user_node["user_id"],
-                    email=user_node["email"],
-                    username=user_node["username"],
-                    full_name=user_node["full_name"],
-                    bio=user_node["bio"],
-                    created_at=user_node["created_at"],
-                )
-            )
+        mutual_followers = [to_user(record["user"]) for record in records]
 
-        return mutual_followers
+        items, next_cursor = paginate(
+            mutual_followers, limit, lambda u: (u.username, u.user_id)
+        )
+        return UserPage.model_construct(items=items, next_cursor=next_cursor)
 
-    async def get_feed(
-        self, user_id: str, limit: int = 50
-    ) -> List[PostResponse]:
-        query = """
-        MATCH (me:User {user_id: $user_id})
+    async def count_mutual_followers(
+        self, user1_id: str, user2_id: str
+    ) -> MutualFollowersCount:
+        key = tuple(sorted((user1_id, user2_id)))
+        count = mutual_count_cache.get(key)
+        if count is None:
+            query = f"""
+            {self._MUTUAL_PAIR}
+            RETURN count(mutual) AS count
+            """
+
+            records = await run_read(
+                self.session, query, user1_id=user1_id, user2_id=user2_id
+            )
+            count = records[0]["count"] if records else 0
+            mutual_count_cache.set(key, count)
 
-        MATCH (author: User)-[:POSTED]->(p:Post)
-        WHERE author.user_id = me.user_id OR (me)-[:FOLLOWS]->(author)
+        return MutualFollowersCount.model_construct(
+            user1_id=user1_id, user2_id=user2_id, count=count
+        )
 
-        OPTIONAL MATCH (liker: User)-[:LIKES]->(p)
-        WITH p, author, COUNT(DISTINCT liker) AS likes_count
+    async def get_feed(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        mode: str = "chronological",
+    ) -> PostPage:
+        """One page of the home feed.
+
+        The pushed inbox and the rings of followed pulled authors are
+        merged newest first. ``mode="ranked"`` orders the result by
+        ``post_scores`` instead; its cursors are not interchangeable with
+        chronological ones.
+        """
+        after = decode_cursor(cursor, 2)
+
+        started = time.perf_counter()
+        pushed = await feed_store.get(user_id)
+        if pushed is None:
+            pushed = await self._build_feed(user_id)
+        pulled_at = time.perf_counter()
+        feed_source_duration.observe(pulled_at - started, "push")
+
+        rings = await self._pulled_rings(user_id)
+        merged_at = time.perf_counter()
+        feed_source_duration.observe(merged_at - pulled_at, "pull")
+
+        entries = merge_sources(pushed, *rings)
+        if mode == "ranked":
+            sort_key = post_scores.sort_key
+            entries = sorted(entries, key=sort_key, reverse=True)
+        else:
+            sort_key = lambda e: e.sort_key  # noqa: E731
+
+        if after is not None:
+            # Validate eagerly: the comparison below runs lazily inside
+            # islice, where a mistyped key would escape as a TypeError.
+            value, post_id = after
+            if not isinstance(post_id, str):
+                raise ValueError("Invalid cursor")
+            if mode == "ranked":
+                if isinstance(value, bool) or not isinstance(
+                    value, (int, float)
+                ):
+                    raise ValueError("Invalid cursor")
+                after_key = (float(value), post_id)
+            else:
+                after_key = (cursor_datetime(value), post_id)
+            entries = (e for e in entries if sort_key(e) < after_key)
+
+        entries = list(itertools.islice(entries, limit + 1))
+        feed_source_duration.observe(time.perf_counter() - merged_at, "merge")
+
+        window, next_cursor = paginate(entries, limit, sort_key)
+        # Sources are capped, so running out of entries only means the end
+        # of the feed when none of them was full.
+        truncated = next_cursor is None and (
+            len(pushed) >= feed_store.max_size
+            or any(len(ring) >= author_rings.ring_size for ring in rings)
+        )
+        post_ids = [entry.post_id for entry in window]
+        if not post_ids:
+            return PostPage.model_construct(items=[], truncated=truncated)
 
-        OPTIONAL MATCH (p) <-[:COMMENTED_ON]-(c:Comment)
-        WITH p, author, likes_count, COUNT(DISTINCT c) AS comments_count
+        query = f"""
+        UNWIND range(0, size($post_ids) - 1) AS idx
+        MATCH (author: User)-[:POSTED]->(p:Post {{post_id: $post_ids[idx]}})
 
-        OPTIONAL MATCH (me: User {user_id: $user_id})-[like:LIKES]->(p)
+        OPTIONAL MATCH (me: User {{user_id: $user_id}})-[like:LIKES]->(p)
 
-        RETURN p, author, likes_count, comments_count, like IS NOT NULL AS is_liked
-        ORDER BY p.created_at DESC
-        LIMIT $limit
+        RETURN {post_projection("p", "author")} AS post,
+               like IS NOT NULL AS is_liked
+        ORDER BY idx
         """
 
-        result = await self.session.run(
+        records = await run_read(
+            self.session,
             query,
             user_id=user_id,
-            limit=limit,
+            post_ids=post_ids,
         )
 
-        feed = []
-        async for record in result:
-            post_node = record["p"]
-            author_node = record["author"]
-            feed.append(
-                PostResponse(
-                    post_id=post_node["post_id"],
-                    content=post_node["content"],
-                    image_url=post_node["image_url"],
-                    author_id=author_node["user_id"],
-                    author_username=author_node["username"],
-                    created_at=post_node["created_at"],
-                    likes_count=record["likes_count"],
-                    comments_count=record["comments_count"],
-                    is_liked=record["is_liked"],
-                )
+        feed = [
+            like_buffer.overlay(
+                user_id, to_post(record["post"], is_liked=record["is_liked"])
             )
+            for record in records
+        ]
 
-        return feed
+        return PostPage.model_construct(
+            items=feed, next_cursor=next_cursor, truncated=truncated
+        )
 
-    async def suggest_users(
-        self, user_id: str, limit: int = 50
-    ) -> List[UserResponse]:
+    async def _build_feed(self, user_id: str) -> List[FeedEntry]:
+        """Materialize a cold inbox from the graph (own + followed posts)."""
         query = """
-        MATCH (me:User {user_id: $user_id})-[:FOLLOWS]->(friend)
-        MATCH(friend)-[:FOLLOWS]->(suggestion: User)
-        WHERE suggestion <> me AND NOT (me)-[:FOLLOWS]->(suggestion)
-
-        WITH suggestion, COUNT(DISTINCT friend) AS common_connections_count
-
-        OPTIONAL MATCH (follower: User)-[:FOLLOWS]->(suggestion)
-        WITH suggestion, common_connections_count, COUNT(DISTINCT follower) AS follower_count
-
-        OPTIONAL MATCH (suggestion)-[:FOLLOWS]->(following)
-        WITH suggestion, common_connections_count, follower_count, COUNT(DISTINCT following) AS following_count
-
-        RETURN suggestion, common_connections_count, follower_count, following_count
-        ORDER BY common_connections_count DESC, follower_count DESC
+        MATCH (me:User {user_id: $user_id})
+        CALL {
+            WITH me
+            MATCH (me)-[:POSTED]->(p:Post)
+            RETURN p, me.user_id AS author_id
+            UNION
+            WITH me
+            MATCH (me)-[:FOLLOWS]->(author:User)
+            WHERE $pull_threshold IS NULL
+                  OR coalesce(author.follower_count, 0) < $pull_threshold
+            MATCH (author)-[:POSTED]->(p:Post)
+            RETURN p, author.user_id AS author_id
+        }
+        RETURN p.post_id AS post_id, author_id, p.created_at AS created_at
+        ORDER BY p.created_at DESC
         LIMIT $limit
         """
 
-        result = await self.session.run(
+        records = await run_read(
+            self.session,
             query,
             user_id=user_id,
-            limit=limit,
+            limit=feed_store.max_size,
+            pull_threshold=settings.feed_pull_follower_threshold or None,
         )
 
-        suggestions = []
-        async for record in result:
-            user_node = record["suggestion"]
-            suggestions.append(
-                UserResponse(
-                    user_id=user_node["user_id"],
-                    email=user_node["email"],
-                    username=user_node["username"],
-                    full_name=user_node["full_name"],
-                    bio=user_node["bio"],
-                    created_at=user_node["created_at"],
-                    common_connections_count=record[
-                        "common_connections_count"
-                    ],
-                    follower_count=record["follower_count"],
-                    following_count=record["following_count"],
-                )
+        entries = [
+            FeedEntry(
+                post_id=record["post_id"],
+                author_id=record["author_id"],
+                created_at=to_python_datetime(record["created_at"]),
+            )
+            for record in records
+        ]
+        await feed_store.replace(user_id, entries)
+        return entries
+
+    async def _pulled_rings(self, user_id: str) -> List[Deque[FeedEntry]]:
+        """Rings of the pulled authors ``user_id`` follows, newest first.
+
+        Rings that are missing or expired are loaded in one query.
+        """
+        threshold = settings.feed_pull_follower_threshold
+        if not threshold:
+            return []
+
+        author_ids = pulled_authors_cache.get(user_id)
+        if author_ids is None:
+            query = """
+            MATCH (me:User {user_id: $user_id})-[:FOLLOWS]->(author:User)
+            WHERE author.follower_count >= $pull_threshold
+            RETURN author.user_id AS author_id
+            """
+
+            records = await run_read(
+                self.session, query, user_id=user_id, pull_threshold=threshold
             )
-        return suggestions
+            author_ids = [record["author_id"] for record in records]
+            pulled_authors_cache.set(user_id, author_ids)
+
+        rings = {}
+        missing = []
+        for author_id in author_ids:
+            ring = author_rings.get(author_id)
+            if ring is None:
+                missing.append(author_id)
+            else:
+                rings[author_id] = ring
+
+        if missing:
+            loaded: Dict[str, List[FeedEntry]] = {a: [] for a in missing}
+            for entry in await self._recent_posts(
+                missing, author_rings.ring_size
+            ):
+                loaded[entry.author_id].append(entry)
+            for author_id, entries in loaded.items():
+                rings[author_id] = author_rings.set(author_id, entries)
+
+        return [ring for ring in rings.values() if ring]
+
+    async def suggest_users(
+        self, user_id: str, limit: int = 50
+    ) -> List[UserResponse]:
+        """Stored suggestions, or a live ranking if none are stored yet.
+
+        A live ranking also queues the user for a background refresh so
+        that the next request is a plain lookup.
+        """
+        suggestions = SuggestionService(self.session)
+        stored = await suggestions.get_stored(user_id, limit)
+        if stored is not None:
+            return stored
+
+        suggestion_engine.mark_stale(user_id)
+        ranked = await suggestions.compute(user_id, limit)
+        return [user for user, _ in ranked]
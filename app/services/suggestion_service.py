@@ -0,0 +1,265 @@
+"""Precomputed friend-of-friend follow suggestions.
+
+Suggestions are ranked by the number of followed users ("friends") who
+follow the candidate. Expanding every friend is unbounded when a friend
+follows hundreds of thousands of accounts, so the candidate query reads
+at most ``suggestion_friend_limit`` friends and, through each of them, at
+most ``suggestion_fanout_limit`` candidates. A supernode then costs no
+more than an ordinary account. The cap takes the first relationships the
+store returns rather than a uniform sample, which would still have to
+scan every relationship of the supernode.
+
+The top ``suggestion_store_size`` candidates are stored as
+``(me)-[:SUGGESTED {rank, score}]->(candidate)`` relationships, with
+``me.suggestions_computed_at`` marking when. ``SuggestionEngine``
+recomputes them in the background: when the user's follows change, the
+first time a user without a stored list asks, and periodically for lists
+older than ``suggestion_max_age_seconds``.
+"""
+
+import asyncio
+import logging
+import time
+from typing import List, Optional, Set, Tuple
+
+from neo4j import AsyncSession
+
+from app.config import settings
+from app.database import neo4j_connection
+from app.models.user import UserResponse
+from app.services.projections import to_user, user_projection
+from app.utils.neo4j_helpers import run_read, run_write
+
+logger = logging.getLogger(__name__)
+
+
+class SuggestionService:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_stored(
+        self, user_id: str, limit: int
+    ) -> Optional[List[UserResponse]]:
+        """The stored list, or ``None`` if it was never computed.
+
+        Users followed since the list was computed are skipped.
+        """
+        query = f"""
+        MATCH (me:User {{user_id: $user_id}})
+        WHERE me.suggestions_computed_at IS NOT NULL
+        OPTIONAL MATCH (me)-[r:SUGGESTED]->(suggestion:User)
+        WHERE NOT (me)-[:FOLLOWS]->(suggestion)
+
+        RETURN {user_projection("suggestion")} AS user
+        ORDER BY r.rank
+        LIMIT $limit
+        """
+
+        records = await run_read(
+            self.session, query, user_id=user_id, limit=limit
+        )
+        if not records:
+            return None
+        return [
+            to_user(record["user"])
+            for record in records
+            if record["user"] is not None
+        ]
+
+    async def compute(
+        self, user_id: str, limit: int
+    ) -> List[Tuple[UserResponse, int]]:
+        """Rank candidates live, returning ``(user, score)`` pairs."""
+        query = f"""
+        MATCH (me:User {{user_id: $user_id}})
+        CALL {{
+            WITH me
+            MATCH (me)-[:FOLLOWS]->(friend:User)
+            RETURN friend
+            LIMIT $friend_limit
+        }}
+        CALL {{
+            WITH friend
+            MATCH (friend)-[:FOLLOWS]->(candidate:User)
+            RETURN candidate
+            LIMIT $fanout_limit
+        }}
+        WITH me, candidate, count(*) AS score
+        WHERE candidate <> me AND NOT (me)-[:FOLLOWS]->(candidate)
+
+        RETURN {user_projection("candidate")} AS user, score
+        ORDER BY score DESC, coalesce(candidate.follower_count, 0) DESC
+        LIMIT $limit
+        """
+
+        records = await run_read(
+            self.session,
+            query,
+            user_id=user_id,
+            friend_limit=settings.suggestion_friend_limit,
+            fanout_limit=settings.suggestion_fanout_limit,
+            limit=limit,
+        )
+        return [
+            (to_user(record["user"]), record["score"]) for record in records
+        ]
+
+    async def refresh(self, user_id: str) -> int:
+        """Recompute and store the list for ``user_id``; return its size."""
+        ranked = await self.compute(user_id, settings.suggestion_store_size)
+
+        query = """
+        MATCH (me:User {user_id: $user_id})
+        SET me.suggestions_computed_at = datetime()
+        WITH me
+        CALL {
+            WITH me
+            MATCH (me)-[old:SUGGESTED]->()
+            DELETE old
+        }
+        WITH me
+        UNWIND $suggestions AS suggestion
+        MATCH (candidate:User {user_id: suggestion.user_id})
+        CREATE (me)-[:SUGGESTED {rank: suggestion.rank,
+                                 score: suggestion.score}]->(candidate)
+        """
+
+        await run_write(
+            self.session,
+            query,
+            user_id=user_id,
+            suggestions=[
+                {"user_id": user.user_id, "rank": rank, "score": score}
+                for rank, (user, score) in enumerate(ranked)
+            ],
+        )
+        return len(ranked)
+
+    async def stale_users(self, limit: int) -> List[str]:
+        query = """
+        MATCH (u:User)
+        WHERE u.suggestions_computed_at < datetime() - duration({seconds: $max_age})
+        RETURN u.user_id AS user_id
+        LIMIT $limit
+        """
+
+        records = await run_read(
+            self.session,
+            query,
+            max_age=int(settings.suggestion_max_age_seconds),
+            limit=limit,
+        )
+        return [record["user_id"] for record in records]
+
+
+class SuggestionEngine:
+    """Background workers that keep stored suggestion lists current.
+
+    ``mark_stale`` is cheap and safe to call from request handlers: a user
+    already waiting is not queued twice, and when the queue is full the
+    request is dropped and picked up by the next sweep instead.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        sweep_interval: float,
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.sweep_interval = sweep_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+
+        self.refreshed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.refresh_seconds_total = 0.0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        if self.running or self.workers <= 0:
+            return
+        self._queue = asyncio.Queue(self.queue_size)
+        self._tasks = [
+            asyncio.create_task(self._work()) for _ in range(self.workers)
+        ]
+        if self.sweep_interval > 0:
+            self._tasks.append(asyncio.create_task(self._sweep()))
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue = None
+        self._pending.clear()
+
+    def mark_stale(self, user_id: str) -> None:
+        if not self.running or user_id in self._pending:
+            return
+        try:
+            self._queue.put_nowait(user_id)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return
+        self._pending.add(user_id)
+
+    async def refresh(self, user_id: str) -> None:
+        started = time.perf_counter()
+        try:
+            async with neo4j_connection.session() as session:
+                await SuggestionService(session).refresh(user_id)
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Suggestion refresh failed for {user_id}: {e}")
+            return
+        self.refreshed += 1
+        self.refresh_seconds_total += time.perf_counter() - started
+
+    async def _work(self) -> None:
+        while True:
+            user_id = await self._queue.get()
+            # Follows made while this refresh runs must queue it again.
+            self._pending.discard(user_id)
+            try:
+                await self.refresh(user_id)
+            finally:
+                self._queue.task_done()
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                async with neo4j_connection.session() as session:
+                    user_ids = await SuggestionService(session).stale_users(
+                        self.queue_size
+                    )
+            except Exception as e:
+                logger.warning(f"Suggestion sweep failed: {e}")
+                continue
+            for user_id in user_ids:
+                self.mark_stale(user_id)
+
+    def metrics(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "refresh_seconds_total": self.refresh_seconds_total,
+        }
+
+
+suggestion_engine = SuggestionEngine(
+    workers=settings.suggestion_refresh_workers,
+    queue_size=settings.suggestion_queue_size,
+    sweep_interval=settings.suggestion_sweep_interval_seconds,
+)
@@ -1,23 +1,51 @@
 from neo4j import AsyncSession
-from app.models.user import UserCreate, UserResponse
-from app.utils.security import hash_password
+from neo4j.exceptions import ClientError
+from app.config import settings
+from app.models.user import (
+    UserAutocompleteItem,
+    UserCreate,
+    UserPage,
+    UserResponse,
+)
+from app.utils.password_hasher import password_hasher
 from datetime import datetime, timezone
-from typing import Optional, List
-from app.utils.security import verify_password
+from typing import Dict, List, Optional
+from app.utils.pagination import decode_cursor, paginate
+from app.utils.dataloader import DataLoader
+from app.utils.cache import profile_cache
+from app.utils.neo4j_helpers import first, run_read, run_write
+from app.services.projections import to_user, user_projection
 import uuid
 
+LUCENE_SPECIAL_CHARS = set('+-&|!(){}[]^"~*?:\\/')
+
+
+def escape_lucene(term: str) -> str:
+    return "".join(
+        f"\\{char}" if char in LUCENE_SPECIAL_CHARS else char for char in term
+    )
+
 
 class UserService:
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        profile_loader: Optional[DataLoader[str, UserResponse]] = None,
+    ):
         self.session = session
+        # Routers pass the request's loader from ``get_profile_loader`` so
+        # that every service in a request shares its batches and cache.
+        self.profile_loader = profile_loader or DataLoader(
+            self.get_user_profiles
+        )
 
     async def create_user(self, user_create: UserCreate) -> UserResponse:
-        hashed_password = hash_password(user_create.password)
+        hashed_password = await password_hasher.hash(user_create.password)
         user_id = str(uuid.uuid4())
         created_at = datetime.now(timezone.utc).isoformat()
 
-        query = """
+        query = f"""
         //Query for existing user by email or username
 
         OPTIONAL MATCH (existing:User)
@@ -25,19 +53,22 @@ class UserService:
         WITH existing
         WHERE existing IS NULL
 
-        CREATE (u:User{
+        CREATE (u:User{{
             user_id: $user_id,
             email: $email,
             username: $username,
             full_name: $full_name,
             bio: $bio,
             password_hash: $hashed_password,
-            created_at: datetime($created_at)
-        })
-        RETURN u
+            created_at: datetime($created_at),
+            follower_count: 0,
+            following_count: 0
+        }})
+        RETURN {user_projection("u")} AS user
         """
 
-        result = await self.session.run(
+        records = await run_write(
+            self.session,
             query,
             user_id=user_id,
             email=user_create.email,
@@ -48,41 +79,34 @@ class UserService:
             created_at=datetime.now(timezone.utc).isoformat(),
         )
 
-        record = await result.single()
+        record = first(records)
         if not record:
             raise ValueError(
                 "User with given email or username already exists."
             )
 
-        user_node = record["u"]
-        return UserResponse(
-            user_id=user_node["user_id"],
-            email=user_node["email"],
-            username=user_node["username"],
-            full_name=user_node["full_name"],
-            bio=user_node["bio"],
-            created_at=user_node["created_at"],
-            follower_count=0,
-            following_count=0,
-        )
+        return to_user(record["user"])
 
     async def authenticate_user(
         self, email: str, password: str
     ) -> Optional[dict]:
         query = """
         MATCH (u:User {email: $email})
-        RETURN u
+        RETURN u {.user_id, .email, .username, .full_name, .bio, .created_at,
+                  .password_hash} AS user
         """
 
-        result = await self.session.run(query, email=email)
-        record = await result.single()
+        records = await run_read(self.session, query, email=email)
+        record = first(records)
 
         if not record:
             return None
 
-        user_node = record["u"]
+        user_node = record["user"]
 
-        if not verify_password(password, user_node["password_hash"]):
+        if not await password_hasher.verify(
+            password, user_node["password_hash"]
+        ):
             return None
 
         return {
@@ -95,75 +119,120 @@ class UserService:
         }
 
     async def get_user_profile(self, user_id: str) -> Optional[UserResponse]:
-        query = """
-        MATCH (u:User {user_id: $user_id})
-
-        //count followers
-        OPTIONAL MATCH (follower: User)-[:FOLLOWS]->(u)
-        WITH u, COUNT(DISTINCT follower) AS follower_count
+        """Load one profile; concurrent calls are batched by the loader."""
+        return await self.profile_loader.load(user_id)
+
+    async def get_user_profiles(
+        self, user_ids: List[str]
+    ) -> Dict[str, UserResponse]:
+        profiles = {}
+        missing = []
+        for user_id in user_ids:
+            profile = profile_cache.get(user_id)
+            if profile is None:
+                missing.append(user_id)
+            else:
+                profiles[user_id] = profile
+        if not missing:
+            return profiles
+
+        query = f"""
+        UNWIND $user_ids AS user_id
+        MATCH (u:User {{user_id: user_id}})
+
+        //counters are maintained on write by SocialService
+        RETURN {user_projection("u")} AS user
+        """
 
-        //count following
-        OPTIONAL MATCH (u)-[:FOLLOWS]->(following: User)
-        WITH u, follower_count, COUNT(DISTINCT following) AS following_count
+        records = await run_read(self.session, query, user_ids=missing)
 
-        //return user profile
-        RETURN u, follower_count, following_count
-        """
+        for record in records:
+            profile = to_user(record["user"])
+            profiles[profile.user_id] = profile
+            profile_cache.set(profile.user_id, profile)
+        return profiles
 
-        result = await self.session.run(query, user_id=user_id)
-        record = await result.single()
+    async def search_users(
+        self, query_str: str, limit: int = 20, cursor: Optional[str] = None
+    ) -> UserPage:
+        after = decode_cursor(cursor, 2) or [None, None]
 
-        if not record:
-            return None
+        lucene_query = " AND ".join(
+            f"({term}^2 OR {term}*)"
+            for term in map(escape_lucene, query_str.lower().split())
+        )
+        if not lucene_query:
+            return UserPage.model_construct(items=[])
+
+        cypher = f"""
+        CALL db.index.fulltext.queryNodes('user_search', $lucene_query)
+        YIELD node AS u, score
+        WHERE $after_score IS NULL
+              OR score < $after_score
+              OR (score = $after_score AND u.user_id > $after_id)
+
+        RETURN {user_projection("u")} AS user, score
+        ORDER BY score DESC, u.user_id
+        LIMIT $limit
+        """
 
-        user_node = record["u"]
-        return UserResponse(
-            user_id=user_node["user_id"],
-            email=user_node["email"],
-            username=user_node["username"],
-            full_name=user_node["full_name"],
-            bio=user_node["bio"],
-            created_at=user_node["created_at"],
-            follower_count=record["follower_count"],
-            following_count=record["following_count"],
+        records = await run_read(
+            self.session,
+            cypher,
+            lucene_query=lucene_query,
+            after_score=after[0],
+            after_id=after[1],
+            limit=limit + 1,
         )
 
-    async def search_users(
-        self, query_str: str, limit: int = 20
-    ) -> List[UserResponse]:
-        cypher = """
-        MATCH (u:User)
-        WHERE toLower(u.username) CONTAINS toLower($query_str) OR
-              toLower(u.full_name) CONTAINS toLower($query_str)
+        users = [
+            (record["score"], to_user(record["user"])) for record in records
+        ]
 
-        OPTIONAL MATCH (follower: User)-[:FOLLOWS]->(u)
-        WITH u, COUNT(DISTINCT follower) AS follower_count
+        page, next_cursor = paginate(
+            users, limit, lambda scored: (scored[0], scored[1].user_id)
+        )
+        return UserPage.model_construct(
+            items=[user for _, user in page], next_cursor=next_cursor
+        )
 
-        OPTIONAL MATCH (u)-[:FOLLOWS]->(following: User)
-        WITH u, follower_count, COUNT(DISTINCT following) AS following_count
+    async def autocomplete_users(
+        self, prefix: str, limit: int = 10
+    ) -> List[UserAutocompleteItem]:
+        """Username prefix lookup bounded by a server-side timeout.
 
-        RETURN u, follower_count, following_count
-        ORDER BY follower_count DESC
-        LIMIT $limit
+        Returns an empty list instead of an error when the query does not
+        finish within ``settings.autocomplete_timeout_ms``.
         """
+        term = escape_lucene(prefix.strip().lower())
+        if not term:
+            return []
 
-        result = await self.session.run(
-            cypher, query_str=query_str, limit=limit
+        cypher = """
+        CALL db.index.fulltext.queryNodes(
+            'user_search', $lucene_query, {limit: $limit}
         )
+        YIELD node
+        RETURN node.user_id AS user_id, node.username AS username
+        """
 
-        users = []
-        async for record in result:
-            user_node = record["u"]
-            users.append(
-                UserResponse(
-                    user_id=user_node["user_id"],
-                    email=user_node["email"],
-                    username=user_node["username"],
-                    full_name=user_node["full_name"],
-                    bio=user_node["bio"],
-                    created_at=user_node["created_at"],
-                    follower_count=record["follower_count"],
-                    following_count=record["following_count"],
-                )
+        try:
+            records = await run_read(
+                self.session,
+                cypher,
+                timeout=settings.autocomplete_timeout_ms / 1000,
+                lucene_query=f"username:{term}*",
+                limit=limit,
             )
-        return users
+            return [
+                UserAutocompleteItem.model_construct(
+                    user_id=record["user_id"], username=record["username"]
+                )
+                for record in records
+            ]
+        except ClientError as e:
+            if not (e.code or "").startswith(
+                "Neo.ClientError.Transaction.TransactionTimedOut"
+            ):
+                raise
+            return []
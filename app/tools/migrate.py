@@ -0,0 +1,48 @@
+"""Apply or verify the graph schema migrations.
+
+Usage::
+
+    python -m app.tools.migrate           # apply pending migrations
+    python -m app.tools.migrate --check   # exit 1 if anything is missing
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+
+from app.database import neo4j_connection
+from app.migrations import SchemaError, apply_migrations, check_schema
+
+logger = logging.getLogger(__name__)
+
+
+async def main(check: bool) -> int:
+    await neo4j_connection.connect()
+    try:
+        driver = neo4j_connection.get_driver()
+        if check:
+            await check_schema(driver)
+            logger.info("Schema is up to date")
+        else:
+            applied = await apply_migrations(driver)
+            logger.info(f"Applied schema migrations: {applied or 'none'}")
+        return 0
+    except SchemaError as e:
+        logger.error(str(e))
+        return 1
+    finally:
+        await neo4j_connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="verify the schema without changing it",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(main(args.check)))
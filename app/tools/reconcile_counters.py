@@ -0,0 +1,122 @@
+"""Recompute denormalized counters that have drifted from the graph.
+
+Usage::
+
+    python -m app.tools.reconcile_counters [--batch-size 1000]
+
+``User.follower_count``/``User.following_count`` and
+``Post.likes_count``/``Post.comments_count`` are maintained on write by the
+services. This walks every node in keyset batches, recounts the
+relationships and rewrites only the counters that differ.
+"""
+
+import argparse
+import asyncio
+import logging
+
+from neo4j import AsyncSession
+
+from app.database import neo4j_connection
+from app.utils.neo4j_helpers import first, run_write
+
+logger = logging.getLogger(__name__)
+
+USER_BATCH_QUERY = """
+MATCH (u:User)
+WHERE $after IS NULL OR u.user_id > $after
+WITH u ORDER BY u.user_id LIMIT $batch_size
+
+WITH u,
+     COUNT { (:User)-[:FOLLOWS]->(u) } AS follower_count,
+     COUNT { (u)-[:FOLLOWS]->(:User) } AS following_count
+WITH u, follower_count, following_count,
+     u.follower_count IS NULL OR u.follower_count <> follower_count
+     OR u.following_count IS NULL OR u.following_count <> following_count
+     AS drifted
+
+FOREACH (_ IN CASE WHEN drifted THEN [1] ELSE [] END |
+    SET u.follower_count = follower_count,
+        u.following_count = following_count
+)
+RETURN max(u.user_id) AS last_id,
+       count(u) AS scanned,
+       sum(CASE WHEN drifted THEN 1 ELSE 0 END) AS fixed
+"""
+
+POST_BATCH_QUERY = """
+MATCH (p:Post)
+WHERE $after IS NULL OR p.post_id > $after
+WITH p ORDER BY p.post_id LIMIT $batch_size
+
+WITH p,
+     COUNT { (:User)-[:LIKES]->(p) } AS likes_count,
+     COUNT { (:Comment)-[:COMMENTED_ON]->(p) } AS comments_count
+WITH p, likes_count, comments_count,
+     p.likes_count IS NULL OR p.likes_count <> likes_count
+     OR p.comments_count IS NULL OR p.comments_count <> comments_count
+     AS drifted
+
+FOREACH (_ IN CASE WHEN drifted THEN [1] ELSE [] END |
+    SET p.likes_count = likes_count,
+        p.comments_count = comments_count
+)
+RETURN max(p.post_id) AS last_id,
+       count(p) AS scanned,
+       sum(CASE WHEN drifted THEN 1 ELSE 0 END) AS fixed
+"""
+
+
+async def _reconcile(
+    session: AsyncSession, label: str, query: str, batch_size: int
+) -> int:
+    after = None
+    scanned = 0
+    fixed = 0
+    while True:
+        record = first(
+            await run_write(session, query, after=after, batch_size=batch_size)
+        )
+        if not record or record["scanned"] == 0:
+            break
+
+        after = record["last_id"]
+        scanned += record["scanned"]
+        fixed += record["fixed"]
+        logger.info(f"{label}: scanned {scanned}, fixed {fixed}")
+
+    return fixed
+
+
+async def reconcile_counters(
+    session: AsyncSession, batch_size: int = 1000
+) -> dict:
+    """Reconcile user and post counters, one transaction per batch."""
+    return {
+        "users": await _reconcile(
+            session, "users", USER_BATCH_QUERY, batch_size
+        ),
+        "posts": await _reconcile(
+            session, "posts", POST_BATCH_QUERY, batch_size
+        ),
+    }
+
+
+async def main(batch_size: int):
+    await neo4j_connection.connect()
+    try:
+        async with neo4j_connection.get_driver().session() as session:
+            fixed = await reconcile_counters(session, batch_size)
+        logger.info(
+            f"Reconciled {fixed['users']} users and {fixed['posts']} posts"
+        )
+    finally:
+        await neo4j_connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.batch_size))
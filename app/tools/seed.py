@@ -0,0 +1,422 @@
+"""Generate and bulk-load a synthetic social graph for load testing.
+
+Usage::
+
+    python -m app.tools.seed --users 100000 --avg-following 50 \\
+        --posts-per-user 5 --likes-per-post 8 --comments-per-post 2
+
+Follow targets and post authors are drawn from a bounded power law, so a
+handful of low-index users end up with most of the followers and posts,
+the way real social graphs look. Rows are generated lazily and written in
+``UNWIND`` batches by ``--concurrency`` parallel writer tasks, each with
+its own session; nothing is materialized for the whole graph, so tens of
+millions of relationships fit in constant memory.
+
+Every seeded user shares one bcrypt hash of ``--password`` so hashing
+does not dominate load time. Ids are derived from ``--prefix`` and the
+row index, so runs with different prefixes can share a database. The
+denormalized counters are rebuilt with ``reconcile_counters`` at the end.
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator, List, Optional
+
+from neo4j import AsyncDriver
+
+from app.database import neo4j_connection
+from app.migrations import apply_migrations
+from app.tools.reconcile_counters import reconcile_counters
+from app.utils.neo4j_helpers import run_write
+from app.utils.security import hash_password
+
+logger = logging.getLogger(__name__)
+
+CREATE_USERS_QUERY = """
+UNWIND $rows AS row
+CREATE (:User {
+    user_id: row.user_id,
+    email: row.email,
+    username: row.username,
+    full_name: row.full_name,
+    bio: null,
+    password_hash: $password_hash,
+    created_at: datetime(row.created_at),
+    follower_count: 0,
+    following_count: 0
+})
+"""
+
+CREATE_FOLLOWS_QUERY = """
+UNWIND $rows AS row
+MATCH (follower:User {user_id: row.follower_id})
+MATCH (following:User {user_id: row.following_id})
+CREATE (follower)-[:FOLLOWS {created_at: datetime(row.created_at)}]->(following)
+"""
+
+CREATE_POSTS_QUERY = """
+UNWIND $rows AS row
+MATCH (u:User {user_id: row.author_id})
+CREATE (p:Post {
+    post_id: row.post_id,
+    content: row.content,
+    image_url: null,
+    author_id: u.user_id,
+    author_username: u.username,
+    created_at: datetime(row.created_at),
+    likes_count: 0,
+    comments_count: 0
+})
+CREATE (u)-[:POSTED {created_at: datetime(row.created_at)}]->(p)
+"""
+
+CREATE_LIKES_QUERY = """
+UNWIND $rows AS row
+MATCH (u:User {user_id: row.user_id})
+MATCH (p:Post {post_id: row.post_id})
+CREATE (u)-[:LIKES {created_at: datetime(row.created_at)}]->(p)
+"""
+
+CREATE_COMMENTS_QUERY = """
+UNWIND $rows AS row
+MATCH (u:User {user_id: row.author_id})
+MATCH (p:Post {post_id: row.post_id})
+CREATE (c:Comment {
+    comment_id: row.comment_id,
+    content: row.content,
+    author_id: u.user_id,
+    author_username: u.username,
+    created_at: datetime(row.created_at)
+})
+CREATE (u)-[:COMMENTED]->(c)
+CREATE (c)-[:COMMENTED_ON]->(p)
+"""
+
+
+class PowerLaw:
+    """Samples ranks in ``[0, n)`` with ``P(rank) ~ (rank + 1) ** -alpha``.
+
+    Uses the inverse CDF of the continuous bounded power law, so sampling
+    is O(1) with no per-rank weight table.
+    """
+
+    def __init__(self, n: int, alpha: float, rng: random.Random):
+        if alpha == 1.0:
+            alpha = 1.0001
+        self.n = n
+        self.rng = rng
+        self._exponent = 1.0 - alpha
+        self._span = (n + 1) ** self._exponent - 1.0
+
+    def sample(self) -> int:
+        u = self.rng.random()
+        x = (self._span * u + 1.0) ** (1.0 / self._exponent)
+        return min(int(x) - 1, self.n - 1)
+
+
+class SeedGenerator:
+    """Yields row dicts for each entity type, deterministically per seed."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.users = args.users
+        self.posts = int(args.users * args.posts_per_user)
+        self.namespace = uuid.uuid5(uuid.NAMESPACE_DNS, args.prefix)
+        self.now = datetime.now(timezone.utc)
+        self.window = timedelta(days=args.days).total_seconds()
+
+    def _rng(self, phase: str) -> random.Random:
+        # One stream per phase so changing e.g. --likes-per-post does not
+        # reshuffle the follow graph for the same --seed.
+        return random.Random(f"{self.args.seed}:{phase}")
+
+    def _id(self, kind: str, index: int) -> str:
+        return str(uuid.uuid5(self.namespace, f"{kind}:{index}"))
+
+    def user_id(self, index: int) -> str:
+        return self._id("user", index)
+
+    def post_id(self, index: int) -> str:
+        return self._id("post", index)
+
+    def _timestamp(self, rng: random.Random) -> str:
+        offset = timedelta(seconds=rng.random() * self.window)
+        return (self.now - offset).isoformat()
+
+    def _count(self, rng: random.Random, mean: float) -> int:
+        return int(rng.expovariate(1.0 / mean)) if mean > 0 else 0
+
+    def user_rows(self) -> Iterator[dict]:
+        rng = self._rng("users")
+        prefix = self.args.prefix
+        for i in range(self.users):
+            yield {
+                "user_id": self.user_id(i),
+                "email": f"{prefix}_user_{i}@example.com",
+                "username": f"{prefix}_user_{i}",
+                "full_name": f"{prefix.title()} User {i}",
+                "created_at": self._timestamp(rng),
+            }
+
+    def follow_rows(self) -> Iterator[dict]:
+        rng = self._rng("follows")
+        popularity = PowerLaw(self.users, self.args.alpha, rng)
+        # Pareto(2) has mean 2 * scale, so scale by half the target mean.
+        scale = self.args.avg_following / 2.0
+        cap = min(self.users - 1, self.args.max_following)
+
+        for follower in range(self.users):
+            degree = min(int(scale * rng.paretovariate(2.0)), cap)
+            targets = set()
+            attempts = 0
+            while len(targets) < degree and attempts < degree * 4:
+                attempts += 1
+                target = popularity.sample()
+                if target != follower:
+                    targets.add(target)
+
+            follower_id = self.user_id(follower)
+            for target in targets:
+                yield {
+                    "follower_id": follower_id,
+                    "following_id": self.user_id(target),
+                    "created_at": self._timestamp(rng),
+                }
+
+    def post_rows(self) -> Iterator[dict]:
+        rng = self._rng("posts")
+        authors = PowerLaw(self.users, self.args.alpha, rng)
+        for j in range(self.posts):
+            yield {
+                "post_id": self.post_id(j),
+                "author_id": self.user_id(authors.sample()),
+                "content": f"Seed post {j}",
+                "created_at": self._timestamp(rng),
+            }
+
+    def like_rows(self) -> Iterator[dict]:
+        rng = self._rng("likes")
+        for j in range(self.posts):
+            likes = min(self._count(rng, self.args.likes_per_post), self.users)
+            post_id = self.post_id(j)
+            for liker in rng.sample(range(self.users), likes):
+                yield {
+                    "user_id": self.user_id(liker),
+                    "post_id": post_id,
+                    "created_at": self._timestamp(rng),
+                }
+
+    def comment_rows(self) -> Iterator[dict]:
+        rng = self._rng("comments")
+        index = 0
+        for j in range(self.posts):
+            post_id = self.post_id(j)
+            for _ in range(self._count(rng, self.args.comments_per_post)):
+                yield {
+                    "comment_id": self._id("comment", index),
+                    "post_id": post_id,
+                    "author_id": self.user_id(rng.randrange(self.users)),
+                    "content": f"Seed comment {index}",
+                    "created_at": self._timestamp(rng),
+                }
+                index += 1
+
+
+async def load(
+    driver: AsyncDriver,
+    label: str,
+    query: str,
+    rows: Iterator[dict],
+    batch_size: int,
+    concurrency: int,
+    **params,
+) -> int:
+    """Write ``rows`` in ``UNWIND`` batches using parallel writer tasks.
+
+    The queue is bounded so generation never runs far ahead of the
+    writers. Deadlocks between writers touching the same nodes are
+    transient errors and are retried by ``execute_write``.
+    """
+    queue: "asyncio.Queue[Optional[List[dict]]]" = asyncio.Queue(
+        maxsize=concurrency * 2
+    )
+    written = 0
+    started = time.perf_counter()
+    last_report = started
+
+    async def writer():
+        nonlocal written, last_report
+        async with driver.session() as session:
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    return
+                await run_write(session, query, rows=batch, **params)
+                written += len(batch)
+
+                now = time.perf_counter()
+                if now - last_report >= 5:
+                    last_report = now
+                    logger.info(
+                        f"{label}: {written} rows, "
+                        f"{written / (now - started):.0f} rows/s"
+                    )
+
+    writers = [asyncio.create_task(writer()) for _ in range(concurrency)]
+
+    def check_writers():
+        for task in writers:
+            if task.done() and not task.cancelled():
+                task.result()
+
+    async def put(item):
+        # Race the put against the writers: if they all die (a constraint
+        # violation on a reused --prefix, a dropped connection) nothing
+        # drains the queue and a plain put would block forever.
+        check_writers()
+        put_task = asyncio.ensure_future(queue.put(item))
+        try:
+            while not put_task.done():
+                running = [task for task in writers if not task.done()]
+                await asyncio.wait(
+                    [put_task, *running], return_when=asyncio.FIRST_COMPLETED
+                )
+                check_writers()
+        finally:
+            put_task.cancel()
+
+    try:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                await put(batch)
+                batch = []
+                # Let writers pick up work even when the queue has room.
+                await asyncio.sleep(0)
+        if batch:
+            await put(batch)
+        for _ in writers:
+            await put(None)
+        await asyncio.gather(*writers)
+    except BaseException:
+        for task in writers:
+            task.cancel()
+        raise
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"{label}: wrote {written} rows in {elapsed:.1f}s "
+        f"({written / elapsed if elapsed else 0:.0f} rows/s)"
+    )
+    return written
+
+
+async def seed(driver: AsyncDriver, args: argparse.Namespace) -> dict:
+    generator = SeedGenerator(args)
+    password_hash = hash_password(args.password)
+
+    phases: List[tuple] = [
+        ("users", CREATE_USERS_QUERY, generator.user_rows),
+        ("follows", CREATE_FOLLOWS_QUERY, generator.follow_rows),
+        ("posts", CREATE_POSTS_QUERY, generator.post_rows),
+        ("likes", CREATE_LIKES_QUERY, generator.like_rows),
+        ("comments", CREATE_COMMENTS_QUERY, generator.comment_rows),
+    ]
+
+    totals = {}
+    started = time.perf_counter()
+    for label, query, rows in phases:
+        params = {"password_hash": password_hash} if label == "users" else {}
+        totals[label] = await load(
+            driver,
+            label,
+            query,
+            rows(),
+            args.batch_size,
+            args.concurrency,
+            **params,
+        )
+
+    elapsed = time.perf_counter() - started
+    total = sum(totals.values())
+    logger.info(
+        f"Seeded {total} rows in {elapsed:.1f}s "
+        f"({total / elapsed if elapsed else 0:.0f} rows/s): {totals}"
+    )
+    return totals
+
+
+async def main(args: argparse.Namespace):
+    await neo4j_connection.connect()
+    try:
+        driver = neo4j_connection.get_driver()
+        # The MATCH-by-id lookups rely on the uniqueness constraints.
+        await apply_migrations(driver)
+        await seed(driver, args)
+
+        if not args.skip_reconcile:
+            async with driver.session() as session:
+                fixed = await reconcile_counters(session)
+            logger.info(
+                f"Reconciled {fixed['users']} users "
+                f"and {fixed['posts']} posts"
+            )
+    finally:
+        await neo4j_connection.close()
+
+
+def _positive(cast: Callable) -> Callable:
+    def parse(value: str):
+        parsed = cast(value)
+        if parsed <= 0:
+            raise argparse.ArgumentTypeError(f"must be positive: {value}")
+        return parsed
+
+    return parse
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=_positive(int), default=10_000)
+    parser.add_argument("--avg-following", type=float, default=50.0)
+    parser.add_argument(
+        "--max-following",
+        type=int,
+        default=5000,
+        help="cap on a single user's out-degree",
+    )
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=1.2,
+        help="power-law exponent for follow targets and post authors",
+    )
+    parser.add_argument("--posts-per-user", type=float, default=5.0)
+    parser.add_argument("--likes-per-post", type=float, default=8.0)
+    parser.add_argument("--comments-per-post", type=float, default=2.0)
+    parser.add_argument(
+        "--days",
+        type=_positive(float),
+        default=90.0,
+        help="spread created_at over this many days before now",
+    )
+    parser.add_argument("--batch-size", type=_positive(int), default=5000)
+    parser.add_argument("--concurrency", type=_positive(int), default=4)
+    parser.add_argument("--prefix", default="seed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--password", default="password123")
+    parser.add_argument(
+        "--skip-reconcile",
+        action="store_true",
+        help="leave follower/like counters at 0",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args))
@@ -0,0 +1,108 @@
+"""Size-bounded LRU cache with per-entry expiry."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.config import settings
+
+_MISSING = object()
+
+
+class TTLCache:
+    """LRU cache whose entries also expire at a wall-clock deadline.
+
+    ``ttl`` is the default lifetime in seconds; ``set`` may override it per
+    entry or pass an absolute ``expires_at`` epoch timestamp instead (e.g.
+    a JWT ``exp``). A ``maxsize`` of 0 disables the cache.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        if self.maxsize <= 0:
+            return
+
+        if expires_at is None:
+            ttl = self.ttl if ttl is None else ttl
+            expires_at = time.time() + ttl if ttl is not None else None
+
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared, viewer-independent response bodies. Writers invalidate entries
+# explicitly; the TTL bounds staleness across processes.
+post_cache = TTLCache(
+    maxsize=settings.post_cache_size, ttl=settings.post_cache_ttl_seconds
+)
+profile_cache = TTLCache(
+    maxsize=settings.profile_cache_size,
+    ttl=settings.profile_cache_ttl_seconds,
+)
+
+# "N mutual followers" counts, keyed by the sorted user id pair. A follow
+# changes the count of every pair involving the followed user, which is
+# too many to evict, so these rely on the TTL alone.
+mutual_count_cache = TTLCache(
+    maxsize=settings.mutual_count_cache_size,
+    ttl=settings.mutual_count_cache_ttl_seconds,
+)
+
+# Per user, the followed authors whose posts the feed pulls from rings.
+# Follow and unfollow evict the follower's entry.
+pulled_authors_cache = TTLCache(
+    maxsize=settings.feed_pulled_authors_cache_size,
+    ttl=settings.feed_pulled_authors_cache_ttl_seconds,
+)
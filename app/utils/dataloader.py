@@ -0,0 +1,72 @@
+"""Request-scoped batching of keyed lookups."""
+
+import asyncio
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """Coalesces ``load`` calls made in the same event-loop tick.
+
+    Every key requested before the loop gets back to the loader is sent to
+    ``batch_fn`` in a single call, which must return a mapping of the keys
+    it found. Missing keys resolve to ``None``. Results are memoized for
+    the lifetime of the loader, so create one per request.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]]):
+        self.batch_fn = batch_fn
+        self._futures: Dict[K, asyncio.Future] = {}
+        self._pending: List[Tuple[K, asyncio.Future]] = []
+        # The event loop only keeps weak references to tasks, so batches
+        # in flight are held here until they finish.
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> Optional[V]:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[key] = future
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            self._pending.append((key, future))
+        return await future
+
+    async def load_many(self, keys: List[K]) -> List[Optional[V]]:
+        return await asyncio.gather(*(self.load(key) for key in keys))
+
+    def _dispatch(self):
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[K, asyncio.Future]]):
+        keys = [key for key, _ in batch]
+        futures = [future for _, future in batch]
+        try:
+            results = await self.batch_fn(keys)
+        except Exception as e:
+            for key, future in zip(keys, futures):
+                self._futures.pop(key, None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in zip(keys, futures):
+            if not future.done():
+                future.set_result(results.get(key))
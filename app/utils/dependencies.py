@@ -1,31 +1,88 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from neo4j import AsyncSession
-from app.database import neo4j_connection
-from app.utils.security import decode_access_token
+from typing import AsyncIterator, Optional
+from app.database import LazySession, neo4j_connection
+from app.models.auth import TokenRefreshRequest
+from app.models.user import UserResponse
+from app.services.user_service import UserService
+from app.utils.dataloader import DataLoader
+from app.utils.query_profile import current_profile
+from app.utils.security import (
+    decode_access_token_cached,
+    decode_refresh_token,
+)
+from jose import JWTError
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl="auth/login", auto_error=False
+)
 
 
-async def get_db_session() -> AsyncSession:
-    driver = neo4j_connection.get_driver()
+async def get_db_session() -> AsyncIterator[LazySession]:
+    """Yield a lazy session; it only holds a pool slot inside transactions.
 
-    async with driver.session() as session:
-        try:
-            yield session
-        finally:
-            pass
+    A profiled request registers the session so that the ``PROFILE``
+    re-run reuses it instead of opening a second one.
+    """
+    async with neo4j_connection.session() as session:
+        profile = current_profile.get()
+        if profile is not None:
+            profile.session = session
+        yield session
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> str:
+async def get_profile_loader(
+    session: LazySession = Depends(get_db_session),
+) -> DataLoader[str, UserResponse]:
+    """One profile loader per request, shared by every ``UserService``.
+
+    FastAPI caches dependencies per request, so all resolutions in the
+    same request get this loader and batch through the request's session.
+    """
+    return DataLoader(UserService(session).get_user_profiles)
+
+
+def _user_id_from_token(token: str) -> str:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    token_data = decode_access_token(token)
+    try:
+        token_data = decode_access_token_cached(token)
+    except JWTError:
+        raise credentials_exception
     if not token_data:
         raise credentials_exception
 
     return token_data["user_id"]
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> str:
+    return _user_id_from_token(token)
+
+
+async def get_optional_user(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+) -> Optional[str]:
+    """The caller's user id, or ``None`` for anonymous requests.
+
+    A token that is present but invalid is still rejected with ``401``.
+    """
+    if token is None:
+        return None
+    return _user_id_from_token(token)
+
+
+async def get_refresh_token_payload(
+    refresh_request: TokenRefreshRequest,
+) -> dict:
+    payload = decode_refresh_token(refresh_request.refresh_token)
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+        )
+    return payload
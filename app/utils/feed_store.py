@@ -0,0 +1,255 @@
+"""Materialized per-user home feeds.
+
+Posts are fanned out on write into follower inboxes (``FeedStore``),
+except those by authors with at least ``feed_pull_follower_threshold``
+followers. Those go into a per-author ring (``AuthorRings``) that feeds
+pull from and merge at read time.
+"""
+
+import asyncio
+import heapq
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from app.config import settings
+from app.utils.cache import TTLCache
+
+
+@dataclass(frozen=True)
+class FeedEntry:
+    post_id: str
+    author_id: str
+    created_at: datetime
+
+    def __post_init__(self):
+        # Seed data stores local datetimes; keep every key comparable.
+        if self.created_at.tzinfo is None:
+            object.__setattr__(
+                self,
+                "created_at",
+                self.created_at.replace(tzinfo=timezone.utc),
+            )
+
+    @property
+    def sort_key(self):
+        return (self.created_at, self.post_id)
+
+
+class FeedBackend(ABC):
+    """Storage for feed inboxes, newest entry first.
+
+    ``get`` returns ``None`` for a user whose inbox has not been
+    materialized yet, which callers treat as "rebuild from the graph".
+    ``rebuilt`` marks a ``set`` that replaces the whole inbox from the
+    graph, as opposed to an incremental update of the current one.
+    """
+
+    @abstractmethod
+    async def get(self, user_id: str) -> Optional[List[FeedEntry]]: ...
+
+    @abstractmethod
+    async def set(
+        self, user_id: str, entries: List[FeedEntry], rebuilt: bool = False
+    ) -> None: ...
+
+
+class InMemoryFeedBackend(FeedBackend):
+    """Process-local backend holding at most ``max_users`` inboxes (LRU).
+
+    Posts created in other processes never reach these inboxes. With
+    ``ttl`` set, an inbox expires that many seconds after it was rebuilt
+    from the graph; incremental updates keep its expiry, otherwise an
+    active user's inbox would never pick up posts from other workers.
+    Every expiry reruns the fan-in query, so ``ttl`` of 0 (the default)
+    never expires inboxes and relies on pushes alone.
+    """
+
+    def __init__(self, max_users: int, ttl: float):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._inboxes: (
+            "OrderedDict[str, Tuple[Optional[float], List[FeedEntry]]]"
+        ) = OrderedDict()
+
+    async def get(self, user_id: str) -> Optional[List[FeedEntry]]:
+        item = self._inboxes.get(user_id)
+        if item is None:
+            return None
+        expires_at, entries = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._inboxes[user_id]
+            return None
+        self._inboxes.move_to_end(user_id)
+        return entries
+
+    async def set(
+        self, user_id: str, entries: List[FeedEntry], rebuilt: bool = False
+    ) -> None:
+        current = self._inboxes.get(user_id)
+        if rebuilt or current is None:
+            expires_at = time.monotonic() + self.ttl if self.ttl else None
+        else:
+            expires_at = current[0]
+        self._inboxes[user_id] = (expires_at, entries)
+        self._inboxes.move_to_end(user_id)
+        while len(self._inboxes) > self.max_users:
+            self._inboxes.popitem(last=False)
+
+
+FEED_BACKENDS: Dict[str, Type[FeedBackend]] = {
+    "memory": InMemoryFeedBackend,
+}
+
+
+def _merge(entries: Iterable[FeedEntry], max_size: int) -> List[FeedEntry]:
+    unique = {}
+    for entry in entries:
+        unique.setdefault(entry.post_id, entry)
+    ordered = sorted(unique.values(), key=lambda e: e.sort_key, reverse=True)
+    return ordered[:max_size]
+
+
+_PUSH_BATCH = 256
+
+
+class FeedStore:
+    """Bounded feed inboxes on top of a pluggable ``FeedBackend``."""
+
+    def __init__(self, backend: FeedBackend, max_size: int):
+        self.backend = backend
+        self.max_size = max_size
+
+    async def get(self, user_id: str) -> Optional[List[FeedEntry]]:
+        return await self.backend.get(user_id)
+
+    async def is_materialized(self, user_id: str) -> bool:
+        return await self.backend.get(user_id) is not None
+
+    async def replace(self, user_id: str, entries: List[FeedEntry]) -> None:
+        await self.backend.set(
+            user_id, _merge(entries, self.max_size), rebuilt=True
+        )
+
+    async def push(self, user_ids: Iterable[str], entry: FeedEntry) -> None:
+        """Fan a new post out to every materialized inbox in ``user_ids``.
+
+        Inboxes that are not materialized are skipped; they pick the post
+        up when they are rebuilt on the next read. A new post is the
+        newest entry, so it is prepended without re-sorting. The loop
+        yields every ``_PUSH_BATCH`` inboxes so a large fan-out does not
+        stall other requests.
+        """
+        for i, user_id in enumerate(user_ids, 1):
+            entries = await self.backend.get(user_id)
+            if entries is not None:
+                await self.backend.set(
+                    user_id, [entry, *entries[: self.max_size - 1]]
+                )
+            if i % _PUSH_BATCH == 0:
+                await asyncio.sleep(0)
+
+    async def backfill(
+        self, user_id: str, entries: Iterable[FeedEntry]
+    ) -> None:
+        current = await self.backend.get(user_id)
+        if current is None:
+            return
+        await self.backend.set(
+            user_id, _merge([*current, *entries], self.max_size)
+        )
+
+    async def prune_author(self, user_id: str, author_id: str) -> None:
+        current = await self.backend.get(user_id)
+        if current is None:
+            return
+        await self.backend.set(
+            user_id, [e for e in current if e.author_id != author_id]
+        )
+
+
+class AuthorRings:
+    """The most recent ``ring_size`` posts of each pulled author.
+
+    Rings are loaded from the graph on first use and reloaded after
+    ``ttl`` seconds, which bounds how long a post written by another
+    process stays invisible here. ``get`` returns ``None`` when a ring
+    has to be loaded.
+    """
+
+    def __init__(self, ring_size: int, max_authors: int, ttl: float):
+        self.ring_size = ring_size
+        self._rings = TTLCache(maxsize=max_authors, ttl=ttl)
+
+    def get(self, author_id: str) -> Optional[Deque[FeedEntry]]:
+        return self._rings.get(author_id)
+
+    def set(
+        self, author_id: str, entries: Iterable[FeedEntry]
+    ) -> Deque[FeedEntry]:
+        ordered = sorted(entries, key=lambda e: e.sort_key, reverse=True)
+        ring = deque(ordered, maxlen=self.ring_size)
+        self._rings.set(author_id, ring)
+        return ring
+
+    def push(self, author_id: str, entry: FeedEntry) -> None:
+        ring = self._rings.get(author_id)
+        if ring is not None:
+            ring.appendleft(entry)
+
+    def stats(self) -> dict:
+        return self._rings.stats()
+
+
+def is_pulled_author(follower_count: Optional[int]) -> bool:
+    threshold = settings.feed_pull_follower_threshold
+    return bool(threshold) and (follower_count or 0) >= threshold
+
+
+def merge_sources(*sources: Iterable[FeedEntry]) -> Iterator[FeedEntry]:
+    """Lazily k-way merge newest-first sources, dropping repeated posts.
+
+    A post can be in an inbox and a ring when its author crossed the
+    pull threshold after it was pushed.
+    """
+    seen = set()
+    merged = heapq.merge(*sources, key=lambda e: e.sort_key, reverse=True)
+    for entry in merged:
+        if entry.post_id not in seen:
+            seen.add(entry.post_id)
+            yield entry
+
+
+def create_feed_store() -> FeedStore:
+    try:
+        backend_cls = FEED_BACKENDS[settings.feed_backend]
+    except KeyError:
+        raise ValueError(f"Unknown feed backend: {settings.feed_backend}")
+    return FeedStore(
+        backend_cls(
+            max_users=settings.feed_max_users,
+            ttl=settings.feed_inbox_ttl_seconds,
+        ),
+        max_size=settings.feed_max_size,
+    )
+
+
+feed_store = create_feed_store()
+
+author_rings = AuthorRings(
+    ring_size=settings.feed_author_ring_size,
+    max_authors=settings.feed_author_rings_max,
+    ttl=settings.feed_author_ring_ttl_seconds,
+)
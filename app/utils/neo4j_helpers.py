@@ -1,6 +1,14 @@
 """Helpers for Neo4j integration."""
 
+import time
 from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional
+
+from neo4j import READ_ACCESS, AsyncSession, Record, unit_of_work
+
+from app.database import LazySession
+from app.utils.query_metrics import observe_query, query_errors, query_tag
+from app.utils.query_profile import current_profile
 
 
 def to_python_datetime(value):
@@ -23,3 +31,85 @@ def to_python_datetime(value):
             tzinfo=tz,
         )
     return value
+
+
+async def _collect(tx, query, params):
+    result = await tx.run(query, params)
+    return [record async for record in result]
+
+
+def _transaction_function(timeout):
+    if timeout is None:
+        return _collect
+
+    @unit_of_work(timeout=timeout)
+    async def work(tx, query, params):
+        return await _collect(tx, query, params)
+
+    return work
+
+
+async def run_read(
+    session: AsyncSession,
+    query: str,
+    timeout: Optional[float] = None,
+    **params,
+) -> List[Record]:
+    """Run ``query`` in a managed read transaction and return its records.
+
+    The driver retries transient failures, so the records are fully
+    consumed inside the transaction function.
+    """
+    return await session.execute_read(
+        _transaction_function(timeout), query, params
+    )
+
+
+async def run_write(
+    session: AsyncSession,
+    query: str,
+    timeout: Optional[float] = None,
+    **params,
+) -> List[Record]:
+    """Run ``query`` in a managed write transaction and return its records."""
+    return await session.execute_write(
+        _transaction_function(timeout), query, params
+    )
+
+
+async def stream_read(
+    session: LazySession, query: str, **params
+) -> AsyncIterator[Record]:
+    """Yield the records of ``query`` as the driver receives them.
+
+    Runs in an explicit read transaction (``LazySession.transaction``)
+    rather than a managed one, so a failed stream is not retried. Read
+    access lets a cluster route it to a follower instead of the leader.
+    The driver pulls ``fetch_size`` records at a time and only asks the
+    server for the next batch once the consumer has iterated the current
+    one, so memory stays flat for any result size. The transaction is
+    rolled back when the consumer stops early.
+    """
+    tag = query_tag()
+    started = time.perf_counter()
+    rows = 0
+    async with session.transaction(READ_ACCESS) as tx:
+        try:
+            result = await tx.run(query, params)
+            async for record in result:
+                rows += 1
+                yield record
+            summary = await result.consume()
+        except Exception:
+            query_errors.inc(tag)
+            raise
+    observe_query(
+        tag, query, params, time.perf_counter() - started, rows, summary
+    )
+    profile = current_profile.get()
+    if profile is not None:
+        profile.capture(tag, query, params)
+
+
+def first(records: List[Record]) -> Optional[Record]:
+    return records[0] if records else None
@@ -0,0 +1,60 @@
+"""Opaque keyset cursors for list endpoints."""
+
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last item on a page."""
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[List[Any]]:
+    """Decode a cursor into its ``size`` key values.
+
+    Returns ``None`` when no cursor was given and raises ``ValueError``
+    for anything that was not produced by ``encode_cursor``.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def cursor_datetime(value: Any) -> datetime:
+    """Parse a cursor's timestamp, treating naive values as UTC.
+
+    Raises ``ValueError`` for anything but an ISO 8601 string, so a
+    tampered cursor is rejected before it reaches a comparison or a query.
+    """
+    if not isinstance(value, str):
+        raise ValueError("Invalid cursor")
+    created_at = datetime.fromisoformat(value)
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at
+
+
+def paginate(
+    items: Sequence[T], limit: int, key: Callable[[T], Tuple]
+) -> Tuple[List[T], Optional[str]]:
+    """Split a ``limit + 1`` fetch into a page and its next cursor."""
+    page = list(items[:limit])
+    if len(items) <= limit:
+        return page, None
+    return page, encode_cursor(*key(page[-1]))
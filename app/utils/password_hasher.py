@@ -0,0 +1,116 @@
+"""Bounded executor that keeps bcrypt off the event loop."""
+
+import asyncio
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Callable, Optional
+
+from app.config import settings
+from app.utils.security import hash_password, verify_password
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+def _timed(fn: Callable, *args):
+    started = time.perf_counter()
+    value = fn(*args)
+    return value, time.perf_counter() - started
+
+
+class PasswordHasher:
+    """Runs bcrypt in a thread or process pool with a bounded backlog.
+
+    At most ``workers`` hashes run at once and at most ``queue_size`` more
+    wait for a worker. Anything beyond that is rejected immediately with
+    ``PasswordHasherBusy`` so a login burst cannot build an unbounded
+    backlog.
+    """
+
+    def __init__(self, workers: int, queue_size: int, kind: str = "thread"):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {kind}")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.kind = kind
+        self._executor: Optional[Executor] = None
+        self._in_flight = 0
+
+        self.completed = 0
+        self.rejected = 0
+        self.hash_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+        self.wait_seconds_total = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._in_flight - self.workers)
+
+    async def _submit(self, fn: Callable, *args):
+        if self._in_flight >= self.workers + self.queue_size:
+            self.rejected += 1
+            raise PasswordHasherBusy("Password hashing capacity exhausted")
+
+        self._in_flight += 1
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            value, elapsed = await loop.run_in_executor(
+                self._get_executor(), _timed, fn, *args
+            )
+        finally:
+            self._in_flight -= 1
+
+        self.completed += 1
+        self.hash_seconds_total += elapsed
+        self.hash_seconds_max = max(self.hash_seconds_max, elapsed)
+        self.wait_seconds_total += time.perf_counter() - submitted - elapsed
+        return value
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(
+            verify_password, plain_password, hashed_password
+        )
+
+    def metrics(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "hash_seconds_total": self.hash_seconds_total,
+            "hash_seconds_max": self.hash_seconds_max,
+            "wait_seconds_total": self.wait_seconds_total,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    queue_size=settings.password_hash_queue_size,
+    kind=settings.password_hash_executor,
+)
@@ -0,0 +1,206 @@
+"""Per-query latency metrics and slow-query logging for Neo4j sessions.
+
+``LazySession`` wraps every managed transaction function with
+``instrument_transaction``. Each ``tx.run`` inside it is timed from the
+call until its result has been consumed, and is tagged with the service
+method that issued it (e.g. ``SocialService.get_feed``), found by walking
+the call stack past the session and helper modules.
+"""
+
+import functools
+import logging
+import re
+import sys
+import time
+from typing import Callable, List, Optional
+
+from app.config import settings
+from app.utils.metrics import Counter, Histogram, registry
+from app.utils.query_profile import current_profile
+
+slow_query_logger = logging.getLogger("app.slow_query")
+
+query_duration = registry.register(
+    Histogram(
+        "neo4j_query_duration_seconds",
+        "Client-side time from tx.run until the result was consumed.",
+        ["query"],
+    )
+)
+query_available_after = registry.register(
+    Histogram(
+        "neo4j_query_result_available_after_seconds",
+        "Server-reported time until the first record was available.",
+        ["query"],
+    )
+)
+query_consumed_after = registry.register(
+    Histogram(
+        "neo4j_query_result_consumed_after_seconds",
+        "Server-reported time to stream the rest of the result.",
+        ["query"],
+    )
+)
+query_rows = registry.register(
+    Counter("neo4j_query_rows_total", "Records returned.", ["query"])
+)
+query_errors = registry.register(
+    Counter(
+        "neo4j_query_errors_total",
+        "Transaction function attempts that raised.",
+        ["query"],
+    )
+)
+slow_queries = registry.register(
+    Counter(
+        "neo4j_slow_queries_total",
+        "Queries slower than SLOW_QUERY_THRESHOLD_MS.",
+        ["query"],
+    )
+)
+
+# Frames from these modules are plumbing, not the caller we want to tag.
+_PLUMBING_MODULES = frozenset(
+    {__name__, "app.database", "app.utils.neo4j_helpers"}
+)
+
+# Parameters whose values are credentials or user-authored text.
+_SENSITIVE_PARAM = re.compile(
+    r"password|hash|token|secret|email|content|bio|full_name", re.I
+)
+_MAX_PARAM_LENGTH = 64
+
+
+def query_tag() -> str:
+    """Qualified name of the nearest caller outside the session plumbing."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_globals.get("__name__") not in _PLUMBING_MODULES:
+            return frame.f_code.co_qualname
+        frame = frame.f_back
+    return "unknown"
+
+
+def redact_params(params: dict) -> dict:
+    """Copy of ``params`` that is safe to log.
+
+    Sensitive keys are masked, collections are reduced to their size and
+    long strings are truncated.
+    """
+    redacted = {}
+    for key, value in params.items():
+        if _SENSITIVE_PARAM.search(key):
+            redacted[key] = "<redacted>"
+        elif isinstance(value, (list, tuple, set, dict)):
+            redacted[key] = f"<{type(value).__name__} of {len(value)}>"
+        elif isinstance(value, str) and len(value) > _MAX_PARAM_LENGTH:
+            redacted[key] = value[:_MAX_PARAM_LENGTH] + "..."
+        else:
+            redacted[key] = value
+    return redacted
+
+
+def _seconds(value: Optional[int]) -> Optional[float]:
+    return None if value is None else value / 1000
+
+
+class _CountingResult:
+    """Result proxy that counts the records iterated from it."""
+
+    def __init__(self, result):
+        self._result = result
+        self.rows = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        record = await self._result.__anext__()
+        self.rows += 1
+        return record
+
+    def __getattr__(self, name):
+        return getattr(self._result, name)
+
+
+class _InstrumentedTransaction:
+    def __init__(self, tx, write: bool):
+        self._tx = tx
+        self._write = write
+        self._runs: List[tuple] = []
+
+    async def run(self, query: str, parameters: Optional[dict] = None, **kw):
+        started = time.perf_counter()
+        result = _CountingResult(await self._tx.run(query, parameters, **kw))
+        params = {**(parameters or {}), **kw}
+        self._runs.append((query, params, started, result))
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self._tx, name)
+
+    async def record(self, tag: str) -> None:
+        profile = current_profile.get()
+        for query, params, started, result in self._runs:
+            summary = await result.consume()
+            elapsed = time.perf_counter() - started
+            observe_query(tag, query, params, elapsed, result.rows, summary)
+            if profile is not None:
+                profile.capture(tag, query, params, write=self._write)
+
+
+def observe_query(
+    tag: str,
+    query: str,
+    params: dict,
+    elapsed: float,
+    rows: int,
+    summary=None,
+) -> None:
+    query_duration.observe(elapsed, tag)
+    query_rows.inc(tag, amount=rows)
+
+    available_after = consumed_after = None
+    if summary is not None:
+        available_after = _seconds(summary.result_available_after)
+        consumed_after = _seconds(summary.result_consumed_after)
+    if available_after is not None:
+        query_available_after.observe(available_after, tag)
+    if consumed_after is not None:
+        query_consumed_after.observe(consumed_after, tag)
+
+    threshold = settings.slow_query_threshold_ms
+    if threshold and elapsed * 1000 >= threshold:
+        slow_queries.inc(tag)
+        slow_query_logger.warning(
+            f"Slow query {tag}: {elapsed * 1000:.1f} ms, {rows} rows, "
+            f"server available after {available_after} s, "
+            f"consumed after {consumed_after} s: "
+            f"{' '.join(query.split())} params={redact_params(params)}"
+        )
+
+
+def instrument_transaction(
+    transaction_function: Callable,
+    tag: Optional[str] = None,
+    write: bool = False,
+) -> Callable:
+    """Wrap a managed transaction function to record its queries.
+
+    ``functools.wraps`` carries over the ``timeout``/``metadata`` set by
+    ``neo4j.unit_of_work``. Every retry attempt is recorded separately.
+    """
+    tag = tag or query_tag()
+
+    @functools.wraps(transaction_function)
+    async def work(tx, *args, **kwargs):
+        instrumented = _InstrumentedTransaction(tx, write)
+        try:
+            value = await transaction_function(instrumented, *args, **kwargs)
+        except Exception:
+            query_errors.inc(tag)
+            raise
+        await instrumented.record(tag)
+        return value
+
+    return work
@@ -0,0 +1,195 @@
+"""On-demand ``PROFILE`` capture of the Cypher a request runs.
+
+While a ``QueryProfile`` is active in ``current_profile``, every query the
+request completes, managed or streamed, is remembered. Afterwards
+``QueryProfile.run`` re-executes each read prefixed with ``PROFILE``
+inside an explicit transaction that is always rolled back. Queries from
+write transactions are listed but not re-run: replaying a ``CREATE`` or
+``MERGE`` against the state the request just committed trips uniqueness
+constraints, or profiles a different plan than the one that ran.
+"""
+
+import json
+import re
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+_PROFILE_PREFIX = re.compile(r"^\s*(PROFILE|EXPLAIN)\b", re.I)
+
+current_profile: ContextVar[Optional["QueryProfile"]] = ContextVar(
+    "current_profile", default=None
+)
+
+
+def _plan_tree(plan: dict) -> dict:
+    """Reduce a driver profile dict to the fields worth keeping."""
+    args = plan.get("args", {})
+    return {
+        "operator": plan.get("operatorType"),
+        "details": args.get("Details"),
+        "db_hits": plan.get("dbHits", args.get("DbHits", 0)),
+        "rows": plan.get("rows", args.get("Rows", 0)),
+        "estimated_rows": args.get("EstimatedRows"),
+        "page_cache_hits": plan.get("pageCacheHits"),
+        "page_cache_misses": plan.get("pageCacheMisses"),
+        "children": [_plan_tree(child) for child in plan.get("children", [])],
+    }
+
+
+def _walk(tree: dict):
+    yield tree
+    for child in tree["children"]:
+        yield from _walk(child)
+
+
+class ProfiledQuery:
+    def __init__(self, tag: str, query: str, params: dict, write: bool):
+        self.tag = tag
+        self.query = query
+        self.params = params
+        self.write = write
+        self.plan: Optional[dict] = None
+        self.error: Optional[str] = None
+
+    @property
+    def db_hits(self) -> int:
+        if self.plan is None:
+            return 0
+        return sum(node["db_hits"] or 0 for node in _walk(self.plan))
+
+    @property
+    def rows(self) -> int:
+        return self.plan["rows"] if self.plan else 0
+
+    def hottest_operator(self) -> Optional[dict]:
+        if self.plan is None:
+            return None
+        return max(_walk(self.plan), key=lambda node: node["db_hits"] or 0)
+
+
+class QueryProfile:
+    """Queries captured for one request, and their ``PROFILE`` results."""
+
+    def __init__(self, method: str, path: str):
+        self.profile_id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.started_at = datetime.now(timezone.utc)
+        self.queries: List[ProfiledQuery] = []
+        # The request's own session, registered by ``get_db_session``.
+        self.session = None
+        self._profiled = 0
+
+    def capture(
+        self, tag: str, query: str, params: dict, write: bool = False
+    ) -> None:
+        if not _PROFILE_PREFIX.match(query):
+            self.queries.append(ProfiledQuery(tag, query, params, write))
+
+    async def run(self, session) -> None:
+        """Re-run captured reads under ``PROFILE`` and roll back.
+
+        Only queries captured since the previous call are run, so a
+        streamed response can be profiled once when its headers go out
+        and again when its body is complete.
+        """
+        pending = self.queries[self._profiled :]
+        self._profiled = len(self.queries)
+        for captured in pending:
+            if captured.write:
+                continue
+            try:
+                # Never committed, so the transaction is rolled back.
+                async with session.transaction() as tx:
+                    result = await tx.run(
+                        f"PROFILE {captured.query}", captured.params
+                    )
+                    summary = await result.consume()
+                if summary.profile is not None:
+                    captured.plan = _plan_tree(summary.profile)
+            except Exception as e:
+                captured.error = f"{type(e).__name__}: {e}"
+
+    @property
+    def db_hits(self) -> int:
+        return sum(captured.db_hits for captured in self.queries)
+
+    @property
+    def rows(self) -> int:
+        return sum(captured.rows for captured in self.queries)
+
+    def headers(self) -> dict:
+        """Compact summary suitable for response headers."""
+        headers = {
+            "X-Query-Profile": (
+                f"queries={len(self.queries)}; db_hits={self.db_hits}; "
+                f"rows={self.rows}"
+            ),
+            "X-Query-Profile-Id": self.profile_id,
+        }
+        per_query = [
+            (
+                f"{captured.tag} write (not profiled)"
+                if captured.write
+                else f"{captured.tag} db_hits={captured.db_hits} "
+                f"rows={captured.rows}"
+            )
+            for captured in self.queries
+        ]
+        if per_query:
+            headers["X-Query-Profile-Queries"] = ", ".join(per_query)
+
+        hottest = max(
+            (
+                (captured, captured.hottest_operator())
+                for captured in self.queries
+                if captured.plan is not None
+            ),
+            key=lambda pair: pair[1]["db_hits"] or 0,
+            default=None,
+        )
+        if hottest is not None:
+            captured, operator = hottest
+            headers["X-Query-Profile-Hottest"] = (
+                f"{captured.tag} {operator['operator']} "
+                f"db_hits={operator['db_hits']}"
+            )
+        return headers
+
+    def to_dict(self, redact) -> dict:
+        return {
+            "profile_id": self.profile_id,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at.isoformat(),
+            "db_hits": self.db_hits,
+            "rows": self.rows,
+            "queries": [
+                {
+                    "tag": captured.tag,
+                    "query": captured.query,
+                    "params": redact(captured.params),
+                    "write": captured.write,
+                    "db_hits": captured.db_hits,
+                    "rows": captured.rows,
+                    "error": captured.error,
+                    "plan": captured.plan,
+                }
+                for captured in self.queries
+            ],
+        }
+
+    def write(self, directory: Path, redact) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", self.path).strip("_")
+        stamp = self.started_at.strftime("%Y%m%dT%H%M%S")
+        path = directory / (
+            f"{stamp}-{self.method}-{slug or 'root'}-{self.profile_id}.json"
+        )
+        path.write_text(
+            json.dumps(self.to_dict(redact), indent=2, default=str)
+        )
+        return path
@@ -0,0 +1,75 @@
+"""orjson responses for models built from trusted database records."""
+
+from typing import Any, AsyncIterable, AsyncIterator
+
+import orjson
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+from app.utils.neo4j_helpers import to_python_datetime
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.__dict__
+    native = to_python_datetime(value)
+    if native is not value:
+        return native
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class ModelJSONResponse(ORJSONResponse):
+    """Serializes Pydantic models with orjson, skipping ``response_model``.
+
+    FastAPI validates and re-encodes whatever an endpoint returns against
+    its ``response_model``, unless the endpoint returns a ``Response``.
+    Services build read models with ``model_construct`` from records the
+    database already constrained, so endpoints wrap them in this class to
+    skip that second pass; ``response_model`` stays on the route for the
+    OpenAPI schema. Datetimes render as RFC 3339 with ``Z`` for UTC,
+    matching Pydantic's JSON output.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=_OPTIONS,
+        )
+
+
+async def _ndjson_chunks(
+    items: AsyncIterable[Any], chunk_size: int
+) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    async for item in items:
+        buffer += orjson.dumps(item, default=_default, option=_OPTIONS)
+        buffer += b"\n"
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+class NDJSONResponse(StreamingResponse):
+    """Streams an async iterable of models as newline-delimited JSON.
+
+    Lines are rendered like ``ModelJSONResponse`` and sent in chunks of
+    about ``chunk_size`` bytes. Each chunk is only produced after the
+    previous one was written to the client, so a slow reader throttles the
+    producer and memory is bounded by one chunk.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def __init__(
+        self,
+        items: AsyncIterable[Any],
+        chunk_size: int = 64 * 1024,
+        **kwargs,
+    ):
+        super().__init__(_ndjson_chunks(items, chunk_size), **kwargs)
@@ -1,11 +1,17 @@
 from passlib.context import CryptContext
 from jose import jwt, JWTError
 from datetime import datetime, timedelta, timezone
+import hashlib
 
 from app.config import settings
+from app.utils.cache import TTLCache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified access-token claims keyed by a SHA-256 digest of the token, kept
+# until the token's own ``exp``.
+token_cache = TTLCache(maxsize=settings.token_cache_size)
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -35,6 +41,16 @@ def decode_access_token(token: str) -> dict:
         raise e
 
 
+def decode_access_token_cached(token: str) -> dict:
+    """``decode_access_token`` with verified claims served from cache."""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is None:
+        payload = decode_access_token(token)
+        token_cache.set(key, payload, expires_at=payload.get("exp"))
+    return payload
+
+
 def decode_refresh_token(token: str) -> dict | None:
     """Decode and validate refresh token. Returns payload if valid, else None."""
     try:
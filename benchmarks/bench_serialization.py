@@ -0,0 +1,146 @@
+"""Per-item cost of building and rendering read models, before and after.
+
+Usage::
+
+    python -m benchmarks.bench_serialization -o benchmarks/results/serialization.json
+
+``validated`` is the original path: models are built with validation
+(``created_at`` goes through the ``to_python_datetime`` field validator),
+then FastAPI re-validates them against the route's ``response_model`` and
+renders them with the standard ``JSONResponse``. ``constructed`` is the
+current path: ``model_construct`` plus an explicit ``to_python_datetime``
+call, rendered with ``ModelJSONResponse``. ``inner_loops`` is the page
+size, so every reported time is per item.
+"""
+
+import sys
+from pathlib import Path
+
+# pyperf re-executes this file as a script in its worker processes.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pyperf  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import APIRoute, serialize_response  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.models.post import PostPage, PostResponse  # noqa: E402
+from app.models.user import UserPage, UserResponse  # noqa: E402
+from app.utils.neo4j_helpers import to_python_datetime  # noqa: E402
+from app.utils.responses import ModelJSONResponse  # noqa: E402
+from benchmarks.fake_session import post_node, user_node  # noqa: E402
+
+DEFAULT_SIZES = (1, 50, 1000)
+
+
+def _response_field(path: str):
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path:
+            return route.response_field
+    raise LookupError(f"No route {path}")
+
+
+def _post_fields(node: dict) -> dict:
+    return {
+        "post_id": node["post_id"],
+        "content": node["content"],
+        "image_url": node["image_url"],
+        "author_id": node["author_id"],
+        "author_username": node["author_username"],
+        "created_at": node["created_at"],
+        "likes_count": node["likes_count"],
+        "comments_count": node["comments_count"],
+        "is_liked": False,
+    }
+
+
+def _user_fields(node: dict) -> dict:
+    return {
+        "user_id": node["user_id"],
+        "email": node["email"],
+        "username": node["username"],
+        "full_name": node["full_name"],
+        "bio": node["bio"],
+        "created_at": node["created_at"],
+        "follower_count": node["follower_count"],
+        "following_count": node["following_count"],
+    }
+
+
+def _complete(coroutine):
+    # serialize_response never suspends for async endpoints; drive it
+    # directly so event-loop overhead is not billed to the old path.
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("serialize_response suspended")
+
+
+def _validated(page_model, item_model, rows, field):
+    def bench():
+        page = page_model(items=[item_model(**row) for row in rows])
+        content = _complete(
+            serialize_response(field=field, response_content=page)
+        )
+        return JSONResponse(content).body
+
+    return bench
+
+
+def _constructed(page_model, item_model, rows):
+    def bench():
+        items = [
+            item_model.model_construct(
+                **{
+                    **row,
+                    "created_at": to_python_datetime(row["created_at"]),
+                }
+            )
+            for row in rows
+        ]
+        return ModelJSONResponse(page_model.model_construct(items=items)).body
+
+    return bench
+
+
+def _add_cmdline_args(cmd, args):
+    cmd.extend(("--sizes", ",".join(map(str, args.sizes))))
+
+
+def main():
+    runner = pyperf.Runner(add_cmdline_args=_add_cmdline_args)
+    runner.argparser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=list(DEFAULT_SIZES),
+        help="comma-separated page sizes (default: 1,50,1000)",
+    )
+    args = runner.parse_args()
+
+    cases = [
+        ("post", PostPage, PostResponse, post_node, _post_fields),
+        ("user", UserPage, UserResponse, user_node, _user_fields),
+    ]
+    fields_by_model = {
+        PostPage: _response_field("/social/feed"),
+        UserPage: _response_field("/users/search"),
+    }
+    for size in args.sizes:
+        for name, page_model, item_model, node, to_fields in cases:
+            rows = [to_fields(node(i)) for i in range(size)]
+            field = fields_by_model[page_model]
+            runner.bench_func(
+                f"{name}.validated[{size}]",
+                _validated(page_model, item_model, rows, field),
+                inner_loops=size,
+            )
+            runner.bench_func(
+                f"{name}.constructed[{size}]",
+                _constructed(page_model, item_model, rows),
+                inner_loops=size,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Microbenchmarks for the Python-side cost of the service layer.
+
+Usage::
+
+    python -m benchmarks.bench_services -o benchmarks/results/new.json
+    python -m pyperf compare_to old.json new.json --table
+
+Each benchmark drives a real service method against a ``RecordingSession``
+that returns canned records, then renders the result with
+``ModelJSONResponse`` as the route does. Neo4j round trips are excluded,
+so the numbers isolate record-to-Pydantic mapping, ``to_python_datetime``
+conversion and JSON rendering. Every benchmark
+runs at 1, 50 and 1000 items; pass ``--sizes`` to change that.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# pyperf re-executes this file as a script in its worker processes.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pyperf  # noqa: E402
+from neo4j import Record  # noqa: E402
+
+from app.services.post_service import PostService  # noqa: E402
+from app.services.social_service import SocialService  # noqa: E402
+from app.services.user_service import UserService  # noqa: E402
+from app.utils.cache import profile_cache  # noqa: E402
+from app.utils.feed_store import FeedEntry, feed_store  # noqa: E402
+from app.utils.neo4j_helpers import to_python_datetime  # noqa: E402
+from app.utils.responses import ModelJSONResponse  # noqa: E402
+from benchmarks.fake_session import (  # noqa: E402
+    RecordingSession,
+    comment_node,
+    neo4j_datetime,
+    post_node,
+    user_node,
+)
+
+DEFAULT_SIZES = (1, 50, 1000)
+FEED_USER_ID = "user-feed"
+
+
+def _user_records(size: int, **extra) -> list:
+    return [
+        Record(
+            {
+                "user": user_node(i),
+                **{name: value(i) for name, value in extra.items()},
+            }
+        )
+        for i in range(size)
+    ]
+
+
+def _feed_records(size: int) -> list:
+    return [
+        Record({"post": post_node(i), "is_liked": i % 2 == 0})
+        for i in range(size)
+    ]
+
+
+def _comment_records(size: int) -> list:
+    return [Record({"comment": comment_node(i)}) for i in range(size)]
+
+
+def followers_bench(size: int):
+    records = _user_records(size)
+    session = RecordingSession(lambda query, params: records)
+
+    async def bench():
+        service = SocialService(session)
+        page = await service.get_followers("user-0", limit=size)
+        return ModelJSONResponse(page).body
+
+    return bench
+
+
+def search_bench(size: int):
+    records = _user_records(size, score=lambda i: 10.0 - i / size)
+    session = RecordingSession(lambda query, params: records)
+
+    async def bench():
+        service = UserService(session)
+        page = await service.search_users("user", limit=size)
+        return ModelJSONResponse(page).body
+
+    return bench
+
+
+def profiles_bench(size: int):
+    records = _user_records(size)
+    user_ids = [f"user-{i:06d}" for i in range(size)]
+    session = RecordingSession(lambda query, params: records)
+
+    async def bench():
+        # Measure the uncached path; the cache would otherwise serve
+        # every iteration after the first.
+        profile_cache.clear()
+        service = UserService(session)
+        profiles = await service.get_user_profiles(user_ids)
+        return ModelJSONResponse(list(profiles.values())).body
+
+    return bench
+
+
+def comments_bench(size: int):
+    records = _comment_records(size)
+    session = RecordingSession(lambda query, params: records)
+
+    async def bench():
+        service = PostService(session)
+        page = await service.get_post_comments("post-0", limit=size)
+        return ModelJSONResponse(page).body
+
+    return bench
+
+
+def feed_bench(size: int):
+    records = _feed_records(size)
+    # Only the page query returns rows: the user follows no pulled authors.
+    session = RecordingSession(
+        lambda query, params: records if "is_liked" in query else []
+    )
+
+    feed_store.max_size = max(feed_store.max_size, size)
+    entries = [
+        FeedEntry(
+            post_id=f"post-{i:06d}",
+            author_id=f"user-{i:06d}",
+            created_at=to_python_datetime(neo4j_datetime(i)),
+        )
+        for i in range(size)
+    ]
+    asyncio.run(feed_store.replace(FEED_USER_ID, entries))
+
+    async def bench():
+        service = SocialService(session)
+        page = await service.get_feed(FEED_USER_ID, limit=size)
+        return ModelJSONResponse(page).body
+
+    return bench
+
+
+def to_python_datetime_bench(size: int):
+    values = [neo4j_datetime(i) for i in range(size)]
+
+    def bench():
+        return [to_python_datetime(value) for value in values]
+
+    return bench
+
+
+ASYNC_BENCHMARKS = {
+    "social.followers": followers_bench,
+    "users.search": search_bench,
+    "users.batch_profiles": profiles_bench,
+    "posts.comments": comments_bench,
+    "social.feed": feed_bench,
+}
+
+
+def _add_cmdline_args(cmd, args):
+    cmd.extend(("--sizes", ",".join(map(str, args.sizes))))
+
+
+def main():
+    runner = pyperf.Runner(add_cmdline_args=_add_cmdline_args)
+    runner.argparser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=list(DEFAULT_SIZES),
+        help="comma-separated list sizes (default: 1,50,1000)",
+    )
+    args = runner.parse_args()
+
+    for size in args.sizes:
+        for name, factory in ASYNC_BENCHMARKS.items():
+            runner.bench_async_func(f"{name}[{size}]", factory(size))
+        runner.bench_func(
+            f"to_python_datetime[{size}]", to_python_datetime_bench(size)
+        )
+
+
+if __name__ == "__main__":
+    main()
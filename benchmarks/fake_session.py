@@ -0,0 +1,106 @@
+"""In-memory stand-in for ``neo4j.AsyncSession`` used by the benchmarks."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+
+from neo4j import Record
+from neo4j.time import DateTime
+
+Responder = Callable[[str, dict], List[Record]]
+
+
+class FakeResult:
+    def __init__(self, records: List[Record]):
+        self._records = iter(records)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Record:
+        try:
+            return next(self._records)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeTransaction:
+    def __init__(self, session: "RecordingSession"):
+        self.session = session
+
+    async def run(self, query: str, parameters: Optional[dict] = None, **kw):
+        params = {**(parameters or {}), **kw}
+        self.session.queries.append((query, params))
+        return FakeResult(self.session.responder(query, params))
+
+
+class RecordingSession:
+    """Answers every query with canned records and records what was run.
+
+    ``responder(query, params)`` returns the records for each query. The
+    managed-transaction entry points call the transaction function with a
+    fake transaction, so ``run_read``/``run_write`` and their record
+    collection are exercised exactly as against a real session.
+    """
+
+    def __init__(self, responder: Responder):
+        self.responder = responder
+        self.queries: List[tuple] = []
+
+    async def run(self, query: str, parameters: Optional[dict] = None, **kw):
+        return await FakeTransaction(self).run(query, parameters, **kw)
+
+    async def execute_read(self, transaction_function, *args, **kwargs):
+        return await transaction_function(
+            FakeTransaction(self), *args, **kwargs
+        )
+
+    execute_write = execute_read
+
+    async def close(self):
+        pass
+
+
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def neo4j_datetime(i: int) -> DateTime:
+    return DateTime.from_native(_EPOCH - timedelta(minutes=i))
+
+
+# Row maps in the shape of the projections in app/services/projections.py.
+
+
+def user_node(i: int) -> dict:
+    return {
+        "user_id": f"user-{i:06d}",
+        "email": f"user{i}@example.com",
+        "username": f"user_{i:06d}",
+        "full_name": f"User {i}",
+        "bio": "Benchmark user with a short bio",
+        "created_at": neo4j_datetime(i),
+        "follower_count": i,
+        "following_count": i // 2,
+    }
+
+
+def post_node(i: int) -> dict:
+    return {
+        "post_id": f"post-{i:06d}",
+        "content": "Benchmark post content " * 4,
+        "image_url": None,
+        "author_id": f"user-{i:06d}",
+        "author_username": f"user_{i:06d}",
+        "created_at": neo4j_datetime(i),
+        "likes_count": i,
+        "comments_count": i // 3,
+    }
+
+
+def comment_node(i: int) -> dict:
+    return {
+        "comment_id": f"comment-{i:06d}",
+        "content": "Benchmark comment",
+        "author_id": f"user-{i:06d}",
+        "author_username": f"user_{i:06d}",
+        "created_at": neo4j_datetime(i),
+    }
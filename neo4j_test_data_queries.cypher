@@ -27,7 +27,9 @@ RETURN count(n) as total_nodes;
 // SECTION 2: CREATE CONSTRAINTS AND INDEXES
 // ============================================================================
 
-// These ensure data integrity and query performance
+// These ensure data integrity and query performance.
+// The API applies the same schema on startup (app/migrations.py), so this
+// section is only needed when seeding a database the app has never used.
 
 CREATE CONSTRAINT user_email_unique IF NOT EXISTS
 FOR (u:User) REQUIRE u.email IS UNIQUE;